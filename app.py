@@ -1,162 +1,117 @@
 from flask import Flask, request, jsonify
-import requests
-import json
+import os
+import sys
 import threading
 import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import schedule
-from urllib.parse import urlparse
+
+from core import (
+    API_PAGE_LIMIT, API_PAGE_MAX, DISPATCH_PROFILE_WINDOW, SCHEDULER_MODE,
+    SCHEDULER_MODES, STATS_RESOLUTIONS, active_schedules, callback_lock,
+    change_feeds, clear_request_history, complete_callback, expand_record,
+    get_dispatch_profile, get_dns_stats, get_spread_jobs, get_stage_timings,
+    get_stats, history_lock, load_saved_apis, make_api_key, make_api_request,
+    pending_callbacks, request_history, save_api_config, saved_apis,
+    schedule_api_request, search_apis, start_spread_schedule, validate_url
+)
 
 app = Flask(__name__)
 
-# İstek geçmişini saklamak için
-request_history = []
-
-# Kayıtlı API konfigürasyonları
-saved_apis = {
-    "default": {
-        "name": "Email to User API",
-        "url": "https://email-to-user.onrender.com/email_to_user",
-        "method": "POST",
-        "headers": {
-            "Content-Type": "application/json"
-        },
-        "data_type": "json",  # json, form, params
-        "data": {
-            "email": "{email}",
-            "dev": "@Z4usXcode"
-        }
-    }
-}
+# Kayıtlı API'leri dosyadan yükle
+load_saved_apis()
 
-# Aktif schedule'lar
-active_schedules = {}
+# Asenkron /test-api işleri için sınırlı executor
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 4))
+# Kuyrukta bekleyen + çalışan iş sayısı üst sınırı
+JOB_QUEUE_SIZE = int(os.environ.get("JOB_QUEUE_SIZE", 32))
+JOB_RETRY_AFTER = int(os.environ.get("JOB_RETRY_AFTER", 2))
+# Long-polling için izin verilen en uzun bekleme (saniye)
+JOB_MAX_WAIT = 60
+# Bellekte tutulan en fazla iş kaydı
+JOB_HISTORY_LIMIT = 1000
 
-def validate_url(url):
-    """URL doğrulama"""
-    try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except:
-        return False
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+job_slots = threading.BoundedSemaphore(JOB_QUEUE_SIZE)
+# İşler: job_id -> iş kaydı (eklenme sırasına göre)
+jobs = OrderedDict()
+jobs_lock = threading.Lock()
 
-def make_api_request(api_config, custom_data=None):
-    """API'ye istek gönderen fonksiyon"""
-    try:
-        url = api_config["url"]
-        method = api_config.get("method", "GET").upper()
-        headers = api_config.get("headers", {})
-        data_type = api_config.get("data_type", "json")
-        
-        # Data'yı hazırla
-        data = api_config.get("data", {})
-        if custom_data:
-            # Custom data ile merge et
-            if isinstance(data, dict) and isinstance(custom_data, dict):
-                data.update(custom_data)
-            else:
-                data = custom_data
-        
-        print(f"[{datetime.now()}] {api_config['name']} için istek gönderiliyor...")
-        print(f"URL: {url}")
-        print(f"Method: {method}")
-        print(f"Data: {data}")
-        
-        response = None
-        timeout = api_config.get("timeout", 10)
-        
-        if method == "GET":
-            if data_type == "params" and data:
-                response = requests.get(url, params=data, headers=headers, timeout=timeout)
-            else:
-                response = requests.get(url, headers=headers, timeout=timeout)
-                
-        elif method == "POST":
-            if data_type == "json":
-                response = requests.post(url, json=data, headers=headers, timeout=timeout)
-            elif data_type == "form":
-                response = requests.post(url, data=data, headers=headers, timeout=timeout)
-            elif data_type == "params":
-                response = requests.post(url, params=data, headers=headers, timeout=timeout)
-            else:
-                response = requests.post(url, data=json.dumps(data), headers=headers, timeout=timeout)
-                
-        elif method == "PUT":
-            if data_type == "json":
-                response = requests.put(url, json=data, headers=headers, timeout=timeout)
-            else:
-                response = requests.put(url, data=data, headers=headers, timeout=timeout)
-                
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers, timeout=timeout)
-        
-        # Response'u işle
-        result = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "api_name": api_config["name"],
-            "url": url,
-            "method": method,
-            "status_code": response.status_code,
-            "response_time": response.elapsed.total_seconds() if response else None,
-            "headers": dict(response.headers) if response else {},
-            "response": {}
-        }
-        
-        try:
-            if response.headers.get('content-type', '').startswith('application/json'):
-                result["response"] = response.json()
-            else:
-                result["response"] = {"text": response.text[:500]}  # İlk 500 karakter
-        except:
-            result["response"] = {"text": "Response parse edilemedi"}
-        
-        # Geçmişe ekle (max 100 kayıt)
-        request_history.append(result)
-        if len(request_history) > 100:
-            request_history.pop(0)
-            
-        print(f"[{datetime.now()}] İstek tamamlandı. Durum: {response.status_code}")
-        return result
-        
-    except Exception as e:
-        error_result = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "api_name": api_config.get("name", "Unknown API"),
-            "url": api_config.get("url", ""),
-            "method": api_config.get("method", "GET"),
-            "status_code": "ERROR",
-            "response_time": None,
-            "headers": {},
-            "response": {"error": str(e)}
-        }
-        request_history.append(error_result)
-        if len(request_history) > 100:
-            request_history.pop(0)
-        print(f"[{datetime.now()}] Hata: {str(e)}")
-        return error_result
-
-def schedule_api_request(api_name, api_config, interval_minutes=5, custom_data=None):
-    """Periyodik API isteklerini planlayan fonksiyon"""
-    def job():
-        make_api_request(api_config, custom_data)
-    
-    # Bu API için schedule'ı temizle
-    if api_name in active_schedules:
-        active_schedules[api_name] = False
-    
-    # Yeni schedule oluştur
-    schedule.every(interval_minutes).minutes.do(job)
-    
-    print(f"[{datetime.now()}] {api_name} için {interval_minutes} dakikada bir istek planlandı")
+# /debug/profile sadece bu değişkenle açılır
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+PROFILE_MAX_SECONDS = 60
+PROFILE_INTERVAL = 0.005
+
+def sample_profile(seconds, interval=PROFILE_INTERVAL):
+    """Tüm thread'lerin stack'lerini örnekler, collapsed stack sayılarını döndürür"""
+    own_ident = threading.get_ident()
+    stacks = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            parts = []
+            while frame is not None:
+                code = frame.f_code
+                parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            parts.append(names.get(ident, f"thread-{ident}"))
+            stacks[";".join(reversed(parts))] += 1
+        time.sleep(interval)
+    return stacks
+
+def submit_job(api_config, custom_data=None):
+    """İsteği executor kuyruğuna ekler, kuyruk doluysa None döner"""
+    if not job_slots.acquire(blocking=False):
+        return None
     
-    # İlk isteği hemen gönder
-    threading.Thread(target=make_api_request, args=(api_config, custom_data)).start()
+    job = {
+        "id": uuid.uuid4().hex,
+        "status": "queued",
+        "api_name": api_config.get("name", "Unknown API"),
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "done": threading.Event()
+    }
+    with jobs_lock:
+        jobs[job["id"]] = job
+        # Eski ve tamamlanmış işleri temizle
+        while len(jobs) > JOB_HISTORY_LIMIT:
+            oldest_id, oldest = next(iter(jobs.items()))
+            if not oldest["done"].is_set():
+                break
+            jobs.pop(oldest_id)
     
-    # Schedule loop'u çalıştır
-    active_schedules[api_name] = True
-    while active_schedules.get(api_name, False):
-        schedule.run_pending()
-        time.sleep(1)
+    try:
+        job_executor.submit(run_job, job, api_config, custom_data)
+    except RuntimeError:
+        job_slots.release()
+        with jobs_lock:
+            jobs.pop(job["id"], None)
+        return None
+    return job
+
+def run_job(job, api_config, custom_data=None):
+    """Executor thread'inde işi çalıştırır"""
+    job["status"] = "running"
+    job["started_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        job["result"] = make_api_request(api_config, custom_data)
+    finally:
+        job["status"] = "done"
+        job["finished_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        job_slots.release()
+        job["done"].set()
+
+def job_to_dict(job):
+    """İş kaydını JSON'a uygun hale getirir"""
+    return {k: v for k, v in job.items() if k != "done"}
 
 @app.route('/')
 def index():
@@ -425,6 +380,17 @@ def index():
                             <div class="small-text">Değişkenler için {variable} şeklinde kullanın</div>
                         </div>
                         
+                        <div class="form-group">
+                            <label>Etiketler (opsiyonel, virgülle):</label>
+                            <input type="text" id="api-tags" placeholder="prod, email">
+                        </div>
+                        
+                        <div class="form-group">
+                            <label>Body Dosyası (opsiyonel, POST/PUT):</label>
+                            <input type="text" id="api-body-file" placeholder="payload_100mb.bin">
+                            <div class="small-text">BODY_FILES_DIR altındaki dosya, belleğe alınmadan chunked olarak gönderilir</div>
+                        </div>
+                        
                         <div class="button-group">
                             <button class="button success" onclick="testApi()">🚀 Test Et</button>
                             <button class="button secondary" onclick="saveApi()">💾 Kaydet</button>
@@ -442,6 +408,7 @@ def index():
                     <div>
                         <div class="form-group">
                             <label>API Seç:</label>
+                            <input type="text" id="schedule-api-search" placeholder="API ara..." oninput="searchScheduleApis()" style="margin-bottom: 8px;">
                             <select id="schedule-api" onchange="loadApiForSchedule()">
                                 <option value="">API seçin...</option>
                             </select>
@@ -452,6 +419,15 @@ def index():
                             <input type="number" id="schedule-interval" min="1" value="5">
                         </div>
                         
+                        <div class="form-group">
+                            <label>Mod:</label>
+                            <select id="schedule-mode">
+                                <option value="">Sunucu varsayılanı</option>
+                                <option value="classic">Classic</option>
+                                <option value="spread">Spread (faz kaydırmalı, adaptif)</option>
+                            </select>
+                        </div>
+                        
                         <div class="form-group">
                             <label>Custom Data (opsiyonel, JSON):</label>
                             <textarea id="schedule-custom-data" placeholder='{"email": "dynamic@email.com"}'></textarea>
@@ -473,7 +449,14 @@ def index():
             <!-- Saved APIs Tab -->
             <div id="tab-saved" class="tab-content card">
                 <h2>Kayıtlı API'ler</h2>
+                <div class="form-group">
+                    <input type="text" id="saved-apis-search" placeholder="İsim, URL, host veya tag ile ara..." oninput="searchSavedApis()">
+                </div>
+                <div class="small-text" id="saved-apis-count"></div>
                 <div class="api-list" id="saved-apis-list"></div>
+                <div class="button-group">
+                    <button class="button secondary" id="saved-apis-more" style="display: none;" onclick="loadSavedApis(true)">⬇️ Daha fazla</button>
+                </div>
             </div>
             
             <!-- History Tab -->
@@ -483,6 +466,10 @@ def index():
                     <button class="button secondary" onclick="loadHistory()">🔄 Yenile</button>
                     <button class="button danger" onclick="clearHistory()">🗑️ Temizle</button>
                 </div>
+                <label style="margin-top: 15px;">
+                    <input type="checkbox" id="history-changes-only" style="width: auto;" onchange="loadHistory()">
+                    Sadece değişen schedule response'ları
+                </label>
                 <div id="history-list" style="margin-top: 20px;"></div>
             </div>
         </div>
@@ -531,6 +518,9 @@ def index():
                     apiConfig.data = {};
                 }
                 
+                const bodyFile = document.getElementById('api-body-file').value;
+                if (bodyFile) apiConfig.body_file = bodyFile;
+                
                 if (!apiConfig.url) {
                     alert('URL gerekli!');
                     return;
@@ -563,6 +553,8 @@ def index():
                         <div><strong>URL:</strong> ${result.url}</div>
                         <div><strong>Method:</strong> ${result.method}</div>
                         <div><strong>Response Time:</strong> ${result.response_time || 'N/A'}s</div>
+                        ${result.upload ? `<div><strong>Upload:</strong> ${result.upload.bytes} byte, ${result.upload.mb_per_s || 'N/A'} MB/s</div>` : ''}
+                        ${result.callback ? `<div><strong>Callback:</strong> ${result.callback.status} (${result.callback.url})</div>` : ''}
                         <div><strong>Response:</strong></div>
                         <div class="json-view">${JSON.stringify(result.response, null, 2)}</div>
                     </div>
@@ -593,6 +585,10 @@ def index():
                     apiConfig.data = {};
                 }
                 
+                const bodyFile = document.getElementById('api-body-file').value;
+                if (bodyFile) apiConfig.body_file = bodyFile;
+                apiConfig.tags = document.getElementById('api-tags').value;
+                
                 if (!apiConfig.url) {
                     alert('URL gerekli!');
                     return;
@@ -609,24 +605,70 @@ def index():
                 loadSavedApis();
             }
             
-            // Kayıtlı API'leri yükle
-            async function loadSavedApis() {
-                const response = await fetch('/get-apis');
-                const apis = await response.json();
+            // Kayıtlı API'leri yükle (sayfalı, append=true ise sonraki sayfa eklenir)
+            let savedApisOffset = 0;
+            let savedApisSearchTimer = null;
+            let scheduleApisSearchTimer = null;
+            
+            function apiSearchParams(query, offset, limit) {
+                const params = new URLSearchParams({ offset: offset, limit: limit });
+                const text = query.trim();
+                const tagMatch = text.match(/^tag:(\\S+)$/);
+                const methodMatch = text.match(/^method:(\\S+)$/);
+                const hostMatch = text.match(/^host:(\\S+)$/);
+                if (tagMatch) params.set('tag', tagMatch[1]);
+                else if (methodMatch) params.set('method', methodMatch[1]);
+                else if (hostMatch) params.set('host', hostMatch[1]);
+                else if (text) params.set('q', text);
+                return params;
+            }
+            
+            function createApiCard(api) {
+                const card = document.createElement('div');
+                card.className = 'api-card';
+                card.onclick = () => loadApiToForm(api.key);
                 
-                let html = '';
-                for (const [key, api] of Object.entries(apis)) {
-                    html += `
-                        <div class="api-card" onclick="loadApiToForm('${key}')">
-                            <h4>${api.name}</h4>
-                            <p><strong>URL:</strong> ${api.url}</p>
-                            <p><strong>Method:</strong> ${api.method}</p>
-                            <p><strong>Type:</strong> ${api.data_type}</p>
-                        </div>
-                    `;
+                const title = document.createElement('h4');
+                title.textContent = api.name;
+                card.appendChild(title);
+                
+                const rows = [['URL', api.url], ['Method', api.method], ['Type', api.data_type]];
+                if (api.tags && api.tags.length) rows.push(['Tags', api.tags.join(', ')]);
+                for (const [label, value] of rows) {
+                    const p = document.createElement('p');
+                    const strong = document.createElement('strong');
+                    strong.textContent = label + ': ';
+                    p.appendChild(strong);
+                    p.appendChild(document.createTextNode(value || ''));
+                    card.appendChild(p);
+                }
+                return card;
+            }
+            
+            async function loadSavedApis(append = false) {
+                if (!append) savedApisOffset = 0;
+                const query = document.getElementById('saved-apis-search').value;
+                const response = await fetch('/get-apis?' + apiSearchParams(query, savedApisOffset, 50));
+                const page = await response.json();
+                
+                const list = document.getElementById('saved-apis-list');
+                const fragment = document.createDocumentFragment();
+                page.items.forEach(api => fragment.appendChild(createApiCard(api)));
+                if (append) {
+                    list.appendChild(fragment);
+                } else {
+                    list.replaceChildren(fragment);
+                    if (!page.items.length) list.textContent = 'Kayıtlı API bulunamadı.';
                 }
                 
-                document.getElementById('saved-apis-list').innerHTML = html || '<p>Kayıtlı API bulunamadı.</p>';
+                savedApisOffset += page.items.length;
+                document.getElementById('saved-apis-count').textContent = `${savedApisOffset} / ${page.total} API (tag:, method:, host: ile filtreleyin)`;
+                document.getElementById('saved-apis-more').style.display = savedApisOffset < page.total ? 'block' : 'none';
+            }
+            
+            function searchSavedApis() {
+                clearTimeout(savedApisSearchTimer);
+                savedApisSearchTimer = setTimeout(() => loadSavedApis(), 250);
             }
             
             // Forma API yükle
@@ -640,25 +682,34 @@ def index():
                         document.getElementById('api-data-type').value = api.data_type || 'json';
                         document.getElementById('api-headers').value = JSON.stringify(api.headers || {}, null, 2);
                         document.getElementById('api-data').value = JSON.stringify(api.data || {}, null, 2);
+                        document.getElementById('api-body-file').value = api.body_file || '';
+                        document.getElementById('api-tags').value = (api.tags || []).join(', ');
                         showTab('tab-test');
                     });
             }
             
-            // Schedule için API'leri yükle
+            // Schedule için API'leri yükle (arama sonucunun ilk 200'ü)
             async function loadScheduleApis() {
-                const response = await fetch('/get-apis');
-                const apis = await response.json();
+                const query = document.getElementById('schedule-api-search').value;
+                const response = await fetch('/get-apis?' + apiSearchParams(query, 0, 200));
+                const page = await response.json();
                 
                 const select = document.getElementById('schedule-api');
-                select.innerHTML = '<option value="">API seçin...</option>';
-                
-                for (const [key, api] of Object.entries(apis)) {
-                    select.innerHTML += `<option value="${key}">${api.name}</option>`;
-                }
+                const selected = select.value;
+                const fragment = document.createDocumentFragment();
+                fragment.appendChild(new Option('API seçin...', ''));
+                page.items.forEach(api => fragment.appendChild(new Option(api.name, api.key)));
+                select.replaceChildren(fragment);
+                if (selected) select.value = selected;
                 
                 loadActiveSchedules();
             }
             
+            function searchScheduleApis() {
+                clearTimeout(scheduleApisSearchTimer);
+                scheduleApisSearchTimer = setTimeout(loadScheduleApis, 250);
+            }
+            
             // Seçilen API'yi schedule formuna yükle
             function loadApiForSchedule() {
                 const apiKey = document.getElementById('schedule-api').value;
@@ -694,7 +745,8 @@ def index():
                     body: JSON.stringify({
                         api_key: apiKey,
                         interval: parseInt(interval),
-                        custom_data: customData
+                        custom_data: customData,
+                        mode: document.getElementById('schedule-mode').value || undefined
                     })
                 });
                 
@@ -738,7 +790,8 @@ def index():
             
             // Geçmişi yükle
             async function loadHistory() {
-                const response = await fetch('/history');
+                const changesOnly = document.getElementById('history-changes-only').checked;
+                const response = await fetch(changesOnly ? '/history?changes_only=1' : '/history');
                 const history = await response.json();
                 
                 let html = '';
@@ -757,6 +810,7 @@ def index():
                             </div>
                             <div><strong>URL:</strong> ${req.url}</div>
                             <div><strong>Method:</strong> ${req.method}</div>
+                            ${req.callback ? `<div><strong>Callback:</strong> ${req.callback.status}${req.callback.e2e_latency != null ? ', uçtan uca ' + req.callback.e2e_latency + 's' : ''}</div>` : ''}
                             <div><strong>Response:</strong></div>
                             <div class="json-view">${JSON.stringify(req.response, null, 2)}</div>
                         </div>
@@ -798,9 +852,53 @@ def test_api():
     if not data.get('url'):
         return jsonify({"error": "URL gerekli"}), 400
     
+    # Asenkron mod: işi kuyruğa ekle ve hemen job ID döndür
+    if data.pop('async', False) or request.args.get('async') == '1':
+        job = submit_job(data)
+        if job is None:
+            response = jsonify({"error": "İş kuyruğu dolu, daha sonra tekrar deneyin"})
+            response.headers["Retry-After"] = str(JOB_RETRY_AFTER)
+            return response, 429
+        return jsonify({
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/jobs/{job['id']}"
+        }), 202
+    
     result = make_api_request(data)
     return jsonify(result)
 
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """İş durumunu getir (?wait=N ile tamamlanana kadar bekle)"""
+    with jobs_lock:
+        job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "İş bulunamadı"}), 404
+    
+    try:
+        wait = min(float(request.args.get('wait', 0)), JOB_MAX_WAIT)
+    except ValueError:
+        return jsonify({"error": "Geçersiz wait değeri"}), 400
+    if wait > 0:
+        job["done"].wait(wait)
+    
+    return jsonify(job_to_dict(job))
+
+@app.route('/jobs')
+def get_jobs():
+    """İş kuyruğunun durumunu getir"""
+    with jobs_lock:
+        counts = {"queued": 0, "running": 0, "done": 0}
+        for job in jobs.values():
+            counts[job["status"]] += 1
+    return jsonify({
+        "workers": JOB_WORKERS,
+        "queue_size": JOB_QUEUE_SIZE,
+        "in_flight": counts["queued"] + counts["running"],
+        **counts
+    })
+
 @app.route('/save-api', methods=['POST'])
 def save_api():
     """API kaydet"""
@@ -810,17 +908,43 @@ def save_api():
     if not validate_url(data.get('url', '')):
         return jsonify({"error": "Geçersiz URL"}), 400
     
-    # Benzersiz key oluştur
-    import hashlib
-    api_key = hashlib.md5(f"{data['name']}{data['url']}".encode()).hexdigest()[:8]
+    data.setdefault('name', '')
+    
+    # Benzersiz key oluştur (aynı isim+url için mevcut key kullanılır),
+    # istek planını derle (eski plan geçersiz olur) ve kaydet
+    try:
+        api_key = make_api_key(data['name'], data['url'])
+        save_api_config(api_key, data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except OSError as e:
+        return jsonify({"error": f"API dosyaya kaydedilemedi: {e}"}), 500
     
-    saved_apis[api_key] = data
     return jsonify({"message": "API kaydedildi", "api_key": api_key})
 
 @app.route('/get-apis')
 def get_apis():
-    """Kayıtlı API'leri getir"""
-    return jsonify(saved_apis)
+    """Kayıtlı API'leri sayfalı getir (?q=, host=, method=, tag=, offset=, limit=)"""
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = min(max(int(request.args.get('limit', API_PAGE_LIMIT)), 1), API_PAGE_MAX)
+    except ValueError:
+        return jsonify({"error": "Geçersiz offset/limit"}), 400
+    
+    total, page = search_apis(
+        query=request.args.get('q'),
+        host=request.args.get('host'),
+        method=request.args.get('method'),
+        tag=request.args.get('tag'),
+        offset=offset,
+        limit=limit
+    )
+    return jsonify({
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": [{"key": api_key, **api} for api_key, api in page]
+    })
 
 @app.route('/get-api/<api_key>')
 def get_api(api_key):
@@ -836,20 +960,34 @@ def start_schedule():
     api_key = data.get('api_key')
     interval = data.get('interval', 5)
     custom_data = data.get('custom_data')
+    mode = data.get('mode', SCHEDULER_MODE)
     
     if api_key not in saved_apis:
         return jsonify({"error": "API bulunamadı"}), 404
     
-    # Arka planda schedule thread'ini başlat
-    thread = threading.Thread(
-        target=schedule_api_request,
-        args=(api_key, saved_apis[api_key], interval, custom_data),
-        daemon=True
-    )
-    thread.start()
+    try:
+        interval = float(interval)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Geçersiz interval değeri"}), 400
+    if not 0 < interval < float("inf"):
+        return jsonify({"error": "interval 0'dan büyük bir sayı olmalı"}), 400
+    if mode not in SCHEDULER_MODES:
+        return jsonify({"error": "mode classic veya spread olmalı"}), 400
+    
+    if mode == "spread":
+        # Tek dispatcher thread'i, faz kaydırmalı ve adaptif
+        start_spread_schedule(api_key, saved_apis[api_key], interval, custom_data)
+    else:
+        # Arka planda schedule thread'ini başlat
+        thread = threading.Thread(
+            target=schedule_api_request,
+            args=(api_key, saved_apis[api_key], interval, custom_data),
+            daemon=True
+        )
+        thread.start()
     
     return jsonify({
-        "message": f"{saved_apis[api_key]['name']} için {interval} dakikada bir istekler başlatıldı",
+        "message": f"{saved_apis[api_key]['name']} için {interval:g} dakikada bir istekler başlatıldı",
         "status": "started"
     })
 
@@ -864,6 +1002,20 @@ def stop_schedule():
     
     return jsonify({"error": "Aktif schedule bulunamadı"}), 404
 
+@app.route('/scheduler/jobs')
+def scheduler_jobs():
+    """Spread scheduler işlerini getir"""
+    return jsonify({"mode": SCHEDULER_MODE, "jobs": get_spread_jobs()})
+
+@app.route('/scheduler/profile')
+def scheduler_profile():
+    """Saniye başına dağıtım profilini getir (?window=saniye)"""
+    try:
+        window = min(max(int(request.args.get('window', 300)), 1), DISPATCH_PROFILE_WINDOW)
+    except ValueError:
+        return jsonify({"error": "Geçersiz window değeri"}), 400
+    return jsonify(get_dispatch_profile(window))
+
 @app.route('/active-schedules')
 def get_active_schedules():
     """Aktif schedule'ları getir"""
@@ -871,13 +1023,92 @@ def get_active_schedules():
 
 @app.route('/history')
 def get_history():
-    """İstek geçmişini getir"""
-    return jsonify(request_history)
+    """İstek geçmişini getir (?changes_only=1 ile sadece değişen schedule kayıtları)"""
+    changes_only = request.args.get('changes_only') == '1'
+    with history_lock:
+        records = [
+            expand_record(record) for record in request_history
+            if not changes_only or record["changed"]
+        ]
+    return jsonify(records)
+
+@app.route('/callback/<token>', methods=['GET', 'POST', 'PUT'])
+def receive_callback(token):
+    """Asenkron API'lerin tamamlanma callback'ini al"""
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = {"text": request.get_data(as_text=True)[:500]}
+    
+    info = complete_callback(token, payload)
+    if info is None:
+        return jsonify({"error": "Bekleyen callback bulunamadı"}), 404
+    return jsonify({"message": "Callback alındı", "e2e_latency": info["e2e_latency"]})
+
+@app.route('/callbacks')
+def get_pending_callbacks():
+    """Bekleyen callback'leri getir"""
+    with callback_lock:
+        pending = [
+            {"token": token, "api_name": entry["api_name"], "url": entry["url"]}
+            for token, entry in pending_callbacks.items()
+        ]
+    return jsonify({"pending": len(pending), "callbacks": pending})
+
+@app.route('/stats')
+def stats_view():
+    """API / host bazında zaman kovalı istatistikleri getir"""
+    resolution = request.args.get('resolution', 'minute')
+    by = request.args.get('by', 'api')
+    if resolution not in STATS_RESOLUTIONS:
+        return jsonify({"error": "resolution minute veya hour olmalı"}), 400
+    if by not in ("api", "host"):
+        return jsonify({"error": "by api veya host olmalı"}), 400
+    
+    return jsonify({
+        "resolution": resolution,
+        "by": by,
+        "series": get_stats(resolution, by, request.args.get('key'))
+    })
+
+@app.route('/schedules/<api_key>/changes')
+def get_schedule_changes(api_key):
+    """Schedule'ın response değişiklik akışını getir"""
+    with history_lock:
+        feed = change_feeds.get(api_key)
+        if feed is None:
+            return jsonify({"error": "Değişiklik kaydı bulunamadı"}), 404
+        events = [expand_record(event) for event in feed]
+    return jsonify(events)
+
+@app.route('/debug/profile')
+def debug_profile():
+    """N saniye örnekleyip flamegraph için collapsed stack döndür"""
+    if not PROFILING_ENABLED:
+        return jsonify({"error": "Profiling kapalı (PROFILING_ENABLED=1)"}), 404
+    
+    try:
+        seconds = min(float(request.args.get('seconds', 5)), PROFILE_MAX_SECONDS)
+    except ValueError:
+        return jsonify({"error": "Geçersiz seconds değeri"}), 400
+    
+    stacks = sample_profile(seconds)
+    body = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+    return body + "\n", 200, {"Content-Type": "text/plain; charset=utf-8"}
+
+@app.route('/debug/timings')
+def debug_timings():
+    """make_api_request aşama sürelerini getir"""
+    return jsonify(get_stage_timings())
+
+@app.route('/dns-stats')
+def dns_stats_view():
+    """DNS cache istatistiklerini getir"""
+    return jsonify(get_dns_stats())
 
 @app.route('/clear-history', methods=['POST'])
 def clear_history():
     """Geçmişi temizle"""
-    request_history.clear()
+    clear_request_history()
     return jsonify({"message": "Geçmiş temizlendi"})
 
 if __name__ == '__main__':
@@ -902,6 +1133,5 @@ if __name__ == '__main__':
     ╚══════════════════════════════════════════════════════════╝
     """)
     
-    import os
     port = int(os.environ.get("PORT", 5000))
     app.run(debug=False, host="0.0.0.0", port=port)
@@ -0,0 +1,278 @@
+"""Kayıtlı API'ler için Flask'sız komut satırı çalıştırıcısı
+
+Örnekler:
+    python cli.py list
+    python cli.py run default --data '{"email": "a@b.com"}' --expect-status 200
+    python cli.py batch default --dataset emails.jsonl --concurrency 4
+    python cli.py load default --requests 200 --concurrency 20 --max-latency 1.5
+    python cli.py schedule default --every 10 --ticks 6 --format ndjson
+
+Çıkış kodları: 0 tüm kontroller geçti, 1 en az bir kontrol başarısız, 2 kullanım hatası.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+EXIT_OK = 0
+EXIT_ASSERTION_FAILED = 1
+EXIT_USAGE = 2
+
+
+def parse_args(argv=None):
+    """Komut satırı argümanlarını ayrıştırır"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--apis-file", help="Kayıtlı API dosyası (varsayılan: SAVED_APIS_FILE / saved_apis.json)")
+    common.add_argument("--format", choices=["ndjson", "summary"], default="summary", help="Çıktı formatı")
+    common.add_argument("--data", help="Custom data (JSON)")
+    common.add_argument("--expect-status", help="Beklenen status kodları, virgülle (varsayılan: <400)")
+    common.add_argument("--max-latency", type=float, help="İzin verilen en uzun response süresi (saniye)")
+    common.add_argument("--expect-text", help="Response içinde geçmesi gereken metin")
+    common.add_argument("-q", "--quiet", action="store_true", help="İstek loglarını gizle (varsayılan: stderr)")
+
+    parser = argparse.ArgumentParser(prog="cli.py", description="Kayıtlı API'leri Flask olmadan çalıştırır")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = sub.add_parser("list", help="Kayıtlı API'leri listele")
+    list_parser.add_argument("--apis-file")
+
+    run_parser = sub.add_parser("run", parents=[common], help="Tek istek gönder")
+    run_parser.add_argument("api_key")
+    run_parser.add_argument("--repeat", type=int, default=1, help="Tekrar sayısı")
+
+    batch_parser = sub.add_parser("batch", parents=[common], help="Dataset'teki her satır için istek gönder")
+    batch_parser.add_argument("api_key")
+    batch_parser.add_argument("--dataset", required=True, help=".jsonl, .json (liste) veya .csv dosyası")
+    batch_parser.add_argument("--concurrency", type=int, default=1)
+
+    load_parser = sub.add_parser("load", parents=[common], help="Yük testi")
+    load_parser.add_argument("api_key")
+    load_parser.add_argument("--requests", type=int, default=100, help="Toplam istek sayısı")
+    load_parser.add_argument("--concurrency", type=int, default=10)
+
+    schedule_parser = sub.add_parser("schedule", parents=[common], help="Ön planda periyodik istek çalıştır")
+    schedule_parser.add_argument("api_keys", nargs="+")
+    schedule_parser.add_argument("--every", type=float, default=300, help="Interval (saniye)")
+    schedule_parser.add_argument("--ticks", type=int, help="API başına bu kadar istekten sonra dur (varsayılan: sınırsız)")
+
+    return parser.parse_args(argv)
+
+
+def load_dataset(path):
+    """Dataset satırlarını custom data listesi olarak okur (her satır bir obje olmalı)"""
+    if path.endswith(".csv"):
+        import csv
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = json.load(f)
+    if not isinstance(rows, list):
+        raise ValueError("Dataset bir JSON listesi olmalı")
+    for number, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            raise ValueError(f"Dataset satırı {number} bir JSON objesi değil")
+    return rows
+
+
+def check_result(result, args):
+    """Sonucu kontrollere göre değerlendirir, başarısız kontrolleri döndürür"""
+    failures = []
+    status = result["status_code"]
+    if args.expect_status:
+        expected = {code.strip() for code in args.expect_status.split(",")}
+        if str(status) not in expected:
+            failures.append(f"status {status} beklenen {args.expect_status} değil")
+    elif not isinstance(status, int) or status >= 400:
+        failures.append(f"status {status}")
+
+    latency = result.get("response_time")
+    if args.max_latency is not None and (latency is None or latency > args.max_latency):
+        failures.append(f"response süresi {latency} > {args.max_latency}")
+
+    if args.expect_text and args.expect_text not in json.dumps(result.get("response"), ensure_ascii=False):
+        failures.append(f"response '{args.expect_text}' içermiyor")
+    return failures
+
+
+def percentile(values, pct):
+    """Sıralı listede yüzdelik değer"""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class Reporter:
+    """Sonuçları NDJSON olarak yazar ve özet için biriktirir"""
+
+    def __init__(self, args, out):
+        self.args = args
+        self.out = out
+        self.lock = threading.Lock()
+        self.total = 0
+        self.failed = 0
+        self.status_codes = {}
+        self.latencies = []
+
+    def add(self, result):
+        failures = check_result(result, self.args)
+        with self.lock:
+            self.total += 1
+            self.failed += bool(failures)
+            status = str(result["status_code"])
+            self.status_codes[status] = self.status_codes.get(status, 0) + 1
+            if result.get("response_time") is not None:
+                self.latencies.append(result["response_time"])
+            if self.args.format == "ndjson":
+                record = {**result, "ok": not failures, "failures": failures}
+                self.out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                self.out.flush()
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        return {
+            "total": self.total,
+            "passed": self.total - self.failed,
+            "failed": self.failed,
+            "status_codes": self.status_codes,
+            "elapsed": round(elapsed, 3),
+            "requests_per_s": round(self.total / elapsed, 2) if elapsed else None,
+            "latency": {
+                "mean": round(sum(latencies) / len(latencies), 4) if latencies else None,
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": latencies[-1] if latencies else None
+            }
+        }
+
+
+def run_concurrent(func, items, concurrency):
+    """Öğeleri verilen eşzamanlılıkla işler"""
+    if concurrency <= 1:
+        for item in items:
+            func(item)
+        return
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(func, item) for item in items]:
+            future.result()
+
+
+def run_command(args, core, reporter, custom_data):
+    """Seçilen komutu çalıştırır"""
+    if args.command == "schedule":
+        keys = args.api_keys
+    else:
+        keys = [args.api_key]
+    for key in keys:
+        if core.get_request_plan(key) is None:
+            raise LookupError(f"API bulunamadı: {key}")
+
+    def send(key, data=None):
+        base = core.get_request_plan(key)
+        plan = core.compile_request_plan(base.config, data) if data else base
+        schedule_key = key if args.command == "schedule" else None
+        reporter.add(core.make_api_request(base.config, plan=plan, schedule_key=schedule_key))
+
+    if args.command == "run":
+        for _ in range(args.repeat):
+            send(args.api_key, custom_data)
+
+    elif args.command == "batch":
+        if custom_data is not None and not isinstance(custom_data, dict):
+            raise ValueError("batch için --data bir JSON objesi olmalı")
+        rows = load_dataset(args.dataset)
+        run_concurrent(lambda row: send(args.api_key, {**(custom_data or {}), **row}), rows, args.concurrency)
+
+    elif args.command == "load":
+        key = args.api_key
+        if custom_data:
+            # Merge tek sefer yapılır, her istek aynı planı kullanır
+            plan = core.compile_request_plan(core.get_request_plan(key).config, custom_data)
+        else:
+            plan = core.get_request_plan(key)
+        run_concurrent(lambda _: reporter.add(core.make_api_request(plan.config, plan=plan)),
+                       range(args.requests), args.concurrency)
+
+    elif args.command == "schedule":
+        ticks = {key: 0 for key in keys}
+        next_run = {key: time.monotonic() for key in keys}
+        pending = list(keys) if args.ticks is None or args.ticks > 0 else []
+        try:
+            while pending:
+                now = time.monotonic()
+                for key in pending:
+                    if now >= next_run[key]:
+                        send(key, custom_data)
+                        ticks[key] += 1
+                        next_run[key] += args.every
+                # Son tick'ten sonra bir interval daha beklemeden çık
+                pending = [key for key in keys if args.ticks is None or ticks[key] < args.ticks]
+                if not pending:
+                    break
+                time.sleep(max(0.0, min(next_run[key] for key in pending) - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+
+
+def list_apis(core, out):
+    """Kayıtlı API'leri yazdırır"""
+    for key, api in core.saved_apis.items():
+        out.write(f"{key}\t{api.get('method', 'GET')}\t{api.get('name', '')}\t{api.get('url', '')}\n")
+    return EXIT_OK
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    out = sys.stdout
+
+    custom_data = None
+    if getattr(args, "data", None):
+        try:
+            custom_data = json.loads(args.data)
+        except ValueError as e:
+            sys.stderr.write(f"Geçersiz --data: {e}\n")
+            return EXIT_USAGE
+
+    # Ağır modüller (requests vb.) ancak argümanlar geçerliyse yüklenir
+    import core
+    try:
+        core.load_saved_apis(args.apis_file)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"API dosyası okunamadı: {e}\n")
+        return EXIT_USAGE
+
+    if args.command == "list":
+        return list_apis(core, out)
+
+    reporter = Reporter(args, out)
+    log_target = open(os.devnull, "w") if args.quiet else sys.stderr
+    started = time.perf_counter()
+    try:
+        # core'un istek logları stdout'u (NDJSON) kirletmesin
+        with contextlib.redirect_stdout(log_target):
+            run_command(args, core, reporter, custom_data)
+    except (LookupError, OSError, ValueError) as e:
+        sys.stderr.write(f"Hata: {e}\n")
+        return EXIT_USAGE
+    finally:
+        if args.quiet:
+            log_target.close()
+
+    summary = reporter.summary(time.perf_counter() - started)
+    if args.format == "summary":
+        out.write(json.dumps(summary, ensure_ascii=False, indent=2) + "\n")
+    else:
+        sys.stderr.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    return EXIT_ASSERTION_FAILED if summary["failed"] else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1180 @@
+"""API istek motoru: Flask'tan bağımsız çekirdek (web arayüzü ve CLI kullanır)"""
+import copy
+import hashlib
+import heapq
+import ipaddress
+import itertools
+import json
+import mmap
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from types import MappingProxyType
+from urllib.parse import urlparse
+
+# requests ve schedule ağır modüller; sadece istek gönderilirken / classic
+# schedule başlatılırken yüklenir (CLI'ın list gibi komutları hızlı açılsın)
+
+# İstek geçmişini saklamak için (response yerine response_hash tutulur)
+request_history = []
+HISTORY_LIMIT = 100
+
+# Tekilleştirilmiş response body'leri: hash -> {"body": ..., "refs": n}
+response_store = {}
+# Schedule başına son response hash'i (sadece schedule'lar izlenir, sayısı sınırlı)
+last_response_hash = {}
+# Schedule başına değişiklik akışı
+change_feeds = {}
+CHANGE_FEED_LIMIT = 500
+history_lock = threading.Lock()
+
+# Zaman kovası genişlikleri (saniye) ve saklanacak kova sayısı
+STATS_RESOLUTIONS = {"minute": 60, "hour": 3600}
+STATS_RETENTION = {"minute": 24 * 60, "hour": 7 * 24}
+# Artımlı istatistikler: çözünürlük -> (boyut, anahtar) -> OrderedDict(kova başlangıcı -> sayaçlar)
+stats_buckets = {resolution: {} for resolution in STATS_RESOLUTIONS}
+stats_lock = threading.Lock()
+
+# Kayıtlı API konfigürasyonları
+saved_apis = {
+    "default": {
+        "name": "Email to User API",
+        "url": "https://email-to-user.onrender.com/email_to_user",
+        "method": "POST",
+        "headers": {
+            "Content-Type": "application/json"
+        },
+        "data_type": "json",  # json, form, params
+        "data": {
+            "email": "{email}",
+            "dev": "@Z4usXcode"
+        }
+    }
+}
+
+# Kayıtlı API'lerin saklandığı dosya (web arayüzü ve CLI ortak kullanır)
+SAVED_APIS_FILE = os.environ.get("SAVED_APIS_FILE", "saved_apis.json")
+saved_apis_lock = threading.Lock()
+# Dosya yazımlarını sıraya koyar; aramaları (saved_apis_lock) bloklamaz
+persist_lock = threading.Lock()
+
+# Registry indeksleri (saved_apis_lock altında güncellenir)
+api_identity_index = {}   # (name, url) -> api_key
+api_host_index = {}       # host -> {api_key}
+api_method_index = {}     # method -> {api_key}
+api_tag_index = {}        # tag -> {api_key}
+api_trigram_index = {}    # isim+url içindeki 3'lü harf grubu -> {api_key}
+api_order = {}            # api_key -> ilk kayıt sırası
+_api_seq = itertools.count()
+# /get-apis sayfa boyutu
+API_PAGE_LIMIT = 50
+API_PAGE_MAX = 500
+
+# Aktif schedule'lar
+active_schedules = {}
+
+# Schedule modu: classic (schedule kütüphanesi) veya spread (faz kaydırmalı, adaptif)
+SCHEDULER_MODES = ("classic", "spread")
+SCHEDULER_MODE = os.environ.get("SCHEDULER_MODE", "classic")
+if SCHEDULER_MODE not in SCHEDULER_MODES:
+    raise ValueError(f"SCHEDULER_MODE classic veya spread olmalı, verilen: {SCHEDULER_MODE!r}")
+SCHEDULER_WORKERS = int(os.environ.get("SCHEDULER_WORKERS", 8))
+# Hata veren hedeflerde interval en fazla bu kata kadar uzatılır
+SCHEDULE_MAX_BACKOFF = 8
+# Dağıtım profili için saklanan saniye sayısı
+DISPATCH_PROFILE_WINDOW = 3600
+
+# Classic modda çalışan döngüler: api_key -> döngü token'ı (token değişince eski döngü durur)
+classic_schedules = {}
+# Spread modundaki işler: api_key -> iş kaydı
+spread_jobs = {}
+# (sonraki çalışma zamanı, sıra, iş) heap'i
+spread_heap = []
+_spread_seq = itertools.count()
+spread_cond = threading.Condition()
+_spread_dispatcher = None
+_spread_executor = None
+# Saniye başına dağıtılan iş sayısı: epoch saniyesi -> adet
+dispatch_counts = OrderedDict()
+
+# Kayıtlı API'lerin derlenmiş istek planları: api_key -> RequestPlan
+request_plans = {}
+
+# Bir kez derlenen, değiştirilemez istek planı
+RequestPlan = namedtuple("RequestPlan", [
+    "config", "name", "url", "method", "data_type", "headers", "data",
+    "timeout", "stream", "prepared", "ignore_fields", "dispatch", "callback_timeout"
+])
+
+# Callback'lerin gönderileceği adres (servisin dışarıdan erişilen URL'i)
+CALLBACK_BASE_URL = os.environ.get("CALLBACK_BASE_URL", f"http://localhost:{os.environ.get('PORT', 5000)}")
+CALLBACK_TIMEOUT = float(os.environ.get("CALLBACK_TIMEOUT", 300))
+# Bekleyen callback'ler: token -> {sent_at, deadline, api_name, url, info}
+pending_callbacks = {}
+callback_lock = threading.Lock()
+_callback_sweeper = None
+
+# Büyük body dosyalarının okunabileceği dizin (body_file bu dizine göre çözülür)
+BODY_FILES_DIR = os.environ.get("BODY_FILES_DIR", "payloads")
+# Upstream'e akıtılan her parçanın boyutu
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# DNS cache ayarları (getaddrinfo kayıt TTL'i vermediği için TTL yapılandırılır)
+DNS_CACHE_ENABLED = os.environ.get("DNS_CACHE_ENABLED", "1") == "1"
+DNS_CACHE_TTL = float(os.environ.get("DNS_CACHE_TTL", 30))
+DNS_NEGATIVE_TTL = float(os.environ.get("DNS_NEGATIVE_TTL", 10))
+# TTL'in bu oranı geçildiğinde kayıt arka planda yenilenir
+DNS_REFRESH_AHEAD = 0.8
+
+# DNS cache: (host, port, family, type, proto, flags) -> kayıt
+dns_cache = {}
+# Host bazında DNS istatistikleri
+dns_stats = {}
+dns_lock = threading.Lock()
+_system_getaddrinfo = socket.getaddrinfo
+
+# make_api_request aşama süreleri: aşama -> {count, total, max}
+stage_timings = {}
+stage_lock = threading.Lock()
+
+def validate_url(url):
+    """URL doğrulama"""
+    try:
+        result = urlparse(url)
+        return all([result.scheme, result.netloc])
+    except:
+        return False
+
+def _dns_host_stats(host):
+    """Host için istatistik kaydını döndürür (dns_lock altında çağrılmalı)"""
+    if host not in dns_stats:
+        dns_stats[host] = {
+            "hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "refreshes": 0,
+            "errors": 0,
+            "resolutions": 0,
+            "total_resolve_time": 0.0,
+            "max_resolve_time": 0.0
+        }
+    return dns_stats[host]
+
+def _dns_resolve(key):
+    """Sistem resolver'ı ile çözümler ve sonucu cache'e yazar"""
+    host = key[0]
+    started = time.perf_counter()
+    try:
+        result = _system_getaddrinfo(*key)
+        error = None
+    except socket.gaierror as e:
+        result = None
+        error = e
+    elapsed = time.perf_counter() - started
+    now = time.monotonic()
+    
+    with dns_lock:
+        stats = _dns_host_stats(host)
+        stats["resolutions"] += 1
+        stats["total_resolve_time"] += elapsed
+        stats["max_resolve_time"] = max(stats["max_resolve_time"], elapsed)
+        if error is None:
+            dns_cache[key] = {
+                "result": result,
+                "error": None,
+                "expires": now + DNS_CACHE_TTL,
+                "refresh_at": now + DNS_CACHE_TTL * DNS_REFRESH_AHEAD,
+                "refreshing": False
+            }
+        else:
+            stats["errors"] += 1
+            old = dns_cache.get(key)
+            # Arka plan yenilemesi başarısızsa eski (geçerli) kaydı koru
+            if old and old["error"] is None and old["expires"] > now:
+                old["refreshing"] = False
+            else:
+                dns_cache[key] = {
+                    "result": None,
+                    "error": error,
+                    "expires": now + DNS_NEGATIVE_TTL,
+                    "refresh_at": None,
+                    "refreshing": False
+                }
+    
+    if error is not None:
+        raise error
+    return result
+
+def _dns_background_refresh(key):
+    """Süresi dolmak üzere olan kaydı arka planda yeniler"""
+    try:
+        _dns_resolve(key)
+    except socket.gaierror:
+        pass
+
+def _is_ip_literal(host):
+    """Host bir IP adresi mi?"""
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+def cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """socket.getaddrinfo yerine kullanılan cache'li resolver"""
+    if isinstance(host, bytes):
+        host = host.decode()
+    if not host or _is_ip_literal(host):
+        return _system_getaddrinfo(host, port, family, type, proto, flags)
+    
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with dns_lock:
+        entry = dns_cache.get(key)
+        stats = _dns_host_stats(host)
+        if entry and entry["expires"] > now:
+            if entry["error"] is not None:
+                stats["negative_hits"] += 1
+                raise socket.gaierror(*entry["error"].args)
+            stats["hits"] += 1
+            if now >= entry["refresh_at"] and not entry["refreshing"]:
+                entry["refreshing"] = True
+                stats["refreshes"] += 1
+                threading.Thread(target=_dns_background_refresh, args=(key,), daemon=True).start()
+            return entry["result"]
+        stats["misses"] += 1
+        _prune_dns_cache(now)
+    
+    return _dns_resolve(key)
+
+def _prune_dns_cache(now):
+    """Süresi dolmuş kayıtları siler (dns_lock altında)"""
+    expired = [key for key, entry in dns_cache.items() if entry["expires"] <= now]
+    for key in expired:
+        del dns_cache[key]
+
+def install_dns_cache():
+    """Cache'li resolver'ı process genelinde devreye alır"""
+    if DNS_CACHE_ENABLED:
+        socket.getaddrinfo = cached_getaddrinfo
+
+def get_dns_stats():
+    """Host bazında hit oranı ve çözümleme sürelerini döndürür"""
+    now = time.monotonic()
+    with dns_lock:
+        hosts = {}
+        for host, stats in dns_stats.items():
+            lookups = stats["hits"] + stats["negative_hits"] + stats["misses"]
+            resolutions = stats["resolutions"]
+            hosts[host] = {
+                **{k: v for k, v in stats.items() if k not in ("total_resolve_time", "max_resolve_time")},
+                "hit_rate": round((stats["hits"] + stats["negative_hits"]) / lookups, 4) if lookups else None,
+                "avg_resolve_ms": round(stats["total_resolve_time"] / resolutions * 1000, 3) if resolutions else None,
+                "max_resolve_ms": round(stats["max_resolve_time"] * 1000, 3)
+            }
+        entries = [
+            {
+                "host": key[0],
+                "port": key[1],
+                "negative": entry["error"] is not None,
+                "ttl_remaining": round(entry["expires"] - now, 1)
+            }
+            for key, entry in dns_cache.items() if entry["expires"] > now
+        ]
+    return {
+        "enabled": DNS_CACHE_ENABLED,
+        "ttl": DNS_CACHE_TTL,
+        "negative_ttl": DNS_NEGATIVE_TTL,
+        "hosts": hosts,
+        "entries": entries
+    }
+
+install_dns_cache()
+
+@contextmanager
+def timed_stage(stage):
+    """Bir aşamanın süresini ölçüp stage_timings'e ekler"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with stage_lock:
+            timing = stage_timings.get(stage)
+            if timing is None:
+                timing = stage_timings[stage] = {"count": 0, "total": 0.0, "max": 0.0}
+            timing["count"] += 1
+            timing["total"] += elapsed
+            if elapsed > timing["max"]:
+                timing["max"] = elapsed
+
+def get_stage_timings():
+    """Aşama sürelerini milisaniye cinsinden döndürür"""
+    with stage_lock:
+        return {
+            stage: {
+                "count": t["count"],
+                "total_ms": round(t["total"] * 1000, 3),
+                "mean_ms": round(t["total"] / t["count"] * 1000, 3),
+                "max_ms": round(t["max"] * 1000, 3)
+            }
+            for stage, t in stage_timings.items()
+        }
+
+def resolve_body_file(path):
+    """body_file yolunu BODY_FILES_DIR altında çözer"""
+    base = os.path.realpath(BODY_FILES_DIR)
+    full_path = os.path.realpath(os.path.join(base, path))
+    if os.path.commonpath([base, full_path]) != base:
+        raise ValueError("Body dosyası izin verilen dizinin dışında")
+    if not os.path.isfile(full_path):
+        raise ValueError(f"Body dosyası bulunamadı: {path}")
+    return full_path
+
+def iter_file_chunks(path, chunk_size=STREAM_CHUNK_SIZE):
+    """Dosyayı belleğe almadan mmap ile parça parça okur"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(0, size, chunk_size):
+                yield mm[offset:offset + chunk_size]
+
+def iter_generated_chunks(size, pattern=b"0", chunk_size=STREAM_CHUNK_SIZE):
+    """Belirtilen boyutta sentetik payload üretir"""
+    block = (pattern * (chunk_size // len(pattern) + 1))[:chunk_size]
+    remaining = size
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        yield block if n == chunk_size else block[:n]
+        remaining -= n
+
+def count_upload(chunks, stats):
+    """Gönderilen byte'ları ve süreyi sayan generator"""
+    stats["bytes"] = 0
+    for chunk in chunks:
+        if "started" not in stats:
+            stats["started"] = time.perf_counter()
+        stats["bytes"] += len(chunk)
+        yield chunk
+    stats["finished"] = time.perf_counter()
+
+def build_stream_body(api_config):
+    """body_file / body_generate tanımlıysa chunked gönderilecek body'yi hazırlar"""
+    if api_config.get("body_file"):
+        chunks = iter_file_chunks(resolve_body_file(api_config["body_file"]))
+    elif api_config.get("body_generate"):
+        spec = api_config["body_generate"]
+        size = int(spec.get("size", 0)) or int(float(spec.get("size_mb", 0)) * 1024 * 1024)
+        pattern = str(spec.get("pattern", "0")).encode() or b"0"
+        chunks = iter_generated_chunks(size, pattern)
+    else:
+        return None, None
+    
+    stats = {}
+    return count_upload(chunks, stats), stats
+
+def upload_summary(stats):
+    """Upload istatistiklerini sonuç formatına çevirir"""
+    started = stats.get("started")
+    finished = stats.get("finished")
+    seconds = (finished - started) if started and finished else None
+    mb = stats.get("bytes", 0) / (1024 * 1024)
+    return {
+        "bytes": stats.get("bytes", 0),
+        "seconds": round(seconds, 3) if seconds is not None else None,
+        "mb_per_s": round(mb / seconds, 2) if seconds else None
+    }
+
+def _no_body(data):
+    return {}
+
+def _params_body(data):
+    return {"params": data} if data else {}
+
+def _json_body(data):
+    return {"json": data}
+
+def _form_body(data):
+    return {"data": data}
+
+def _raw_json_body(data):
+    return {"data": json.dumps(data)}
+
+def resolve_dispatch(method, data_type):
+    """Method ve data tipine göre requests argümanlarını üreten fonksiyonu seçer"""
+    if method == "GET":
+        return _params_body if data_type == "params" else _no_body
+    if method == "POST":
+        return {"json": _json_body, "form": _form_body, "params": _params_body}.get(data_type, _raw_json_body)
+    if method == "PUT":
+        return _json_body if data_type == "json" else _form_body
+    if method == "DELETE":
+        return _no_body
+    raise ValueError(f"Desteklenmeyen method: {method}")
+
+def compile_request_plan(api_config, custom_data=None):
+    """API konfigürasyonunu (custom data ile birleştirerek) istek planına derler"""
+    method = api_config.get("method", "GET").upper()
+    data_type = api_config.get("data_type", "json")
+    headers = MappingProxyType(dict(api_config.get("headers") or {}))
+    
+    # Data'yı hazırla (kayıtlı konfigürasyon asla değiştirilmez)
+    data = copy.deepcopy(api_config.get("data", {}))
+    if custom_data:
+        if isinstance(data, dict) and isinstance(custom_data, dict):
+            data = {**data, **copy.deepcopy(custom_data)}
+        else:
+            data = copy.deepcopy(custom_data)
+    
+    dispatch = resolve_dispatch(method, data_type)
+    stream = method in ("POST", "PUT") and bool(api_config.get("body_file") or api_config.get("body_generate"))
+    
+    # callback: true veya {"timeout": saniye}
+    callback = api_config.get("callback")
+    callback_timeout = None
+    if callback:
+        callback_timeout = float(callback.get("timeout", CALLBACK_TIMEOUT)) if isinstance(callback, dict) else CALLBACK_TIMEOUT
+    
+    # Stream body'ler tek kullanımlık, callback body'leri her istekte farklı token
+    # içerdiğinden bu planlar her seferinde hazırlanır
+    prepared = None
+    if not stream and callback_timeout is None:
+        prepared = build_prepared(method, api_config["url"], headers, **dispatch(data))
+    
+    return RequestPlan(
+        config=api_config,
+        name=api_config.get("name", "Unknown API"),
+        url=api_config["url"],
+        method=method,
+        data_type=data_type,
+        headers=headers,
+        data=data,
+        timeout=api_config.get("timeout", 10),
+        stream=stream,
+        prepared=prepared,
+        ignore_fields=frozenset(api_config.get("ignore_fields") or ()),
+        dispatch=dispatch,
+        callback_timeout=callback_timeout
+    )
+
+def get_request_plan(api_key):
+    """Kayıtlı API'nin planını döndürür, yoksa derleyip cache'ler"""
+    plan = request_plans.get(api_key)
+    if plan is None and api_key in saved_apis:
+        plan = request_plans[api_key] = compile_request_plan(saved_apis[api_key])
+    return plan
+
+def build_prepared(method, url, headers, **kwargs):
+    """İsteği Session.prepare_request ile hazırlar (User-Agent, Accept-Encoding vb. varsayılan header'lar dahil)"""
+    import requests
+    with requests.Session() as session:
+        return session.prepare_request(requests.Request(method, url, headers=dict(headers), **kwargs))
+
+def send_prepared(prepared, timeout):
+    """Hazırlanmış isteği requests.request ile aynı ortam ayarlarıyla gönderir"""
+    import requests
+    with requests.Session() as session:
+        settings = session.merge_environment_settings(prepared.url, {}, None, None, None)
+        return session.send(prepared, timeout=timeout, **settings)
+
+def normalize_body(body, ignore_fields):
+    """Hash öncesi değişken alanları (timestamp vb.) her seviyeden çıkarır"""
+    if not ignore_fields:
+        return body
+    if isinstance(body, dict):
+        return {k: normalize_body(v, ignore_fields) for k, v in body.items() if k not in ignore_fields}
+    if isinstance(body, list):
+        return [normalize_body(v, ignore_fields) for v in body]
+    return body
+
+def hash_body(body, ignore_fields=()):
+    """Normalize edilmiş response body'nin içerik hash'i"""
+    encoded = json.dumps(normalize_body(body, ignore_fields), sort_keys=True,
+                         separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def _store_body(body_hash, body):
+    """Body'yi depoya ekler veya referans sayısını artırır (history_lock altında)"""
+    stored = response_store.get(body_hash)
+    if stored is None:
+        stored = response_store[body_hash] = {"body": body, "refs": 0}
+    stored["refs"] += 1
+
+def _release_body(body_hash):
+    """Referansı düşürür, kullanılmayan body'yi siler (history_lock altında)"""
+    stored = response_store.get(body_hash)
+    if stored is not None:
+        stored["refs"] -= 1
+        if stored["refs"] <= 0:
+            del response_store[body_hash]
+
+def expand_record(record):
+    """Kaydı response body'si ile birlikte döndürür"""
+    stored = response_store.get(record["response_hash"])
+    return {**record, "response": stored["body"] if stored else {}}
+
+def _new_bucket():
+    return {
+        "count": 0,
+        "success": 0,
+        "status_codes": {},
+        "latency_total": 0.0,
+        "latency_count": 0,
+        "latency_max": None,
+        "callbacks": 0,
+        "callback_timeouts": 0,
+        "e2e_latency_total": 0.0,
+        "e2e_latency_max": None
+    }
+
+def _stats_cutoff(resolution, now):
+    """Bu kova başlangıcı ve öncesi saklama süresini aşmıştır"""
+    width = STATS_RESOLUTIONS[resolution]
+    return int(now // width) * width - STATS_RETENTION[resolution] * width
+
+def _prune_series(series, cutoff):
+    """Saklama süresini aşan eski kovaları atar (stats_lock altında)"""
+    while series and next(iter(series)) <= cutoff:
+        series.popitem(last=False)
+
+def _stat_buckets(api_name, url, now):
+    """API ve host serilerinde şu anki kovaları döndürür (stats_lock altında)"""
+    keys = (("api", api_name), ("host", urlparse(url).hostname or ""))
+    for resolution, width in STATS_RESOLUTIONS.items():
+        start = int(now // width) * width
+        cutoff = _stats_cutoff(resolution, now)
+        for series_key in keys:
+            series = stats_buckets[resolution].setdefault(series_key, OrderedDict())
+            bucket = series.get(start)
+            if bucket is None:
+                bucket = series[start] = _new_bucket()
+                _prune_series(series, cutoff)
+            yield bucket
+
+def record_stats(result, now=None):
+    """Sonucu API ve host bazındaki zaman kovalarına işler"""
+    now = time.time() if now is None else now
+    status = result["status_code"]
+    success = isinstance(status, int) and 200 <= status < 400
+    latency = result.get("response_time")
+    
+    with stats_lock:
+        for bucket in _stat_buckets(result["api_name"], result["url"], now):
+            bucket["count"] += 1
+            bucket["success"] += success
+            bucket["status_codes"][str(status)] = bucket["status_codes"].get(str(status), 0) + 1
+            if latency is not None:
+                bucket["latency_total"] += latency
+                bucket["latency_count"] += 1
+                if bucket["latency_max"] is None or latency > bucket["latency_max"]:
+                    bucket["latency_max"] = latency
+
+def record_callback_stats(api_name, url, latency, now=None):
+    """Callback sonucunu (latency None ise timeout) istatistiklere işler"""
+    now = time.time() if now is None else now
+    with stats_lock:
+        for bucket in _stat_buckets(api_name, url, now):
+            if latency is None:
+                bucket["callback_timeouts"] += 1
+                continue
+            bucket["callbacks"] += 1
+            bucket["e2e_latency_total"] += latency
+            if bucket["e2e_latency_max"] is None or latency > bucket["e2e_latency_max"]:
+                bucket["e2e_latency_max"] = latency
+
+def get_stats(resolution="minute", by="api", key=None, now=None):
+    """Kova bazında özet istatistikleri döndürür (süresi dolan kovalar ve boş seriler atılır)"""
+    now = time.time() if now is None else now
+    cutoff = _stats_cutoff(resolution, now)
+    series_out = {}
+    with stats_lock:
+        all_series = stats_buckets[resolution]
+        # Trafik almayan serilerin kovaları yazarken değil okurken temizlenir
+        for series_id in list(all_series):
+            _prune_series(all_series[series_id], cutoff)
+            if not all_series[series_id]:
+                del all_series[series_id]
+        for (dimension, series_key), series in all_series.items():
+            if dimension != by or (key is not None and series_key != key):
+                continue
+            series_out[series_key] = [
+                {
+                    "start": datetime.fromtimestamp(start).strftime("%Y-%m-%d %H:%M:%S"),
+                    "count": bucket["count"],
+                    "success_rate": round(bucket["success"] / bucket["count"], 4) if bucket["count"] else None,
+                    "status_codes": dict(bucket["status_codes"]),
+                    "mean_latency": round(bucket["latency_total"] / bucket["latency_count"], 4) if bucket["latency_count"] else None,
+                    "max_latency": bucket["latency_max"],
+                    "callbacks": bucket["callbacks"],
+                    "callback_timeouts": bucket["callback_timeouts"],
+                    "mean_e2e_latency": round(bucket["e2e_latency_total"] / bucket["callbacks"], 4) if bucket["callbacks"] else None,
+                    "max_e2e_latency": bucket["e2e_latency_max"]
+                }
+                for start, bucket in series.items()
+            ]
+    return series_out
+
+def append_history(result, schedule_key=None, ignore_fields=()):
+    """Sonucu tekilleştirilmiş body ile geçmişe ekler (max HISTORY_LIMIT kayıt)"""
+    body_hash = hash_body(result["response"], ignore_fields)
+    source = schedule_key or f"{result['method']} {result['url']}"
+    record = {k: v for k, v in result.items() if k != "response"}
+    record["response_hash"] = body_hash
+    record["source"] = source
+    
+    with history_lock:
+        # Değişiklik takibi sadece schedule'lar için; tekil çağrılarda changed None
+        previous_hash = None
+        record["changed"] = None
+        if schedule_key:
+            previous_hash = last_response_hash.get(schedule_key)
+            record["changed"] = previous_hash != body_hash
+            last_response_hash[schedule_key] = body_hash
+        
+        _store_body(body_hash, result["response"])
+        request_history.append(record)
+        if len(request_history) > HISTORY_LIMIT:
+            _release_body(request_history.pop(0)["response_hash"])
+        
+        # Schedule'larda sadece değişiklikler akışa yazılır
+        if schedule_key and record["changed"]:
+            feed = change_feeds.setdefault(schedule_key, [])
+            _store_body(body_hash, result["response"])
+            feed.append({
+                "timestamp": record["timestamp"],
+                "status_code": record["status_code"],
+                "response_hash": body_hash,
+                "previous_hash": previous_hash
+            })
+            if len(feed) > CHANGE_FEED_LIMIT:
+                _release_body(feed.pop(0)["response_hash"])
+    
+    result["response_hash"] = body_hash
+    result["changed"] = record["changed"]
+    
+    record_stats(result)
+
+def normalize_tags(tags):
+    """Etiketleri (liste veya virgüllü metin) tekil bir listeye çevirir"""
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    result = []
+    for tag in tags or ():
+        tag = str(tag).strip()
+        if tag and tag not in result:
+            result.append(tag)
+    return result
+
+def _search_text(api_config):
+    return f"{api_config.get('name', '')} {api_config.get('url', '')}".lower()
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _api_identity(api_config):
+    """API'yi tanımlayan (isim, url) çifti; isimsiz API'ler "" ile eşleşir"""
+    return api_config.get("name") or "", api_config.get("url") or ""
+
+def _index_keys(api_config):
+    """API'nin yer aldığı (indeks, anahtar) çiftleri"""
+    yield api_host_index, (urlparse(api_config.get("url", "")).hostname or "").lower()
+    yield api_method_index, api_config.get("method", "GET").upper()
+    for tag in api_config.get("tags") or ():
+        yield api_tag_index, tag
+    for gram in _trigrams(_search_text(api_config)):
+        yield api_trigram_index, gram
+
+def _index_api(api_key, api_config):
+    """API'yi indekslere ekler (saved_apis_lock altında)"""
+    api_identity_index[_api_identity(api_config)] = api_key
+    if api_key not in api_order:
+        api_order[api_key] = next(_api_seq)
+    for index, value in _index_keys(api_config):
+        index.setdefault(value, set()).add(api_key)
+
+def _unindex_api(api_key):
+    """API'yi indekslerden çıkarır (saved_apis_lock altında)"""
+    api_config = saved_apis.get(api_key)
+    if api_config is None:
+        return
+    identity = _api_identity(api_config)
+    if api_identity_index.get(identity) == api_key:
+        del api_identity_index[identity]
+    for index, value in _index_keys(api_config):
+        keys = index.get(value)
+        if keys is not None:
+            keys.discard(api_key)
+            if not keys:
+                del index[value]
+
+def make_api_key(name, url):
+    """İsim+URL için kalıcı ve çakışmasız API key üretir"""
+    identity = (name or "", url or "")
+    with saved_apis_lock:
+        existing = api_identity_index.get(identity)
+        if existing is not None:
+            return existing
+        digest = hashlib.sha256("\0".join(identity).encode()).hexdigest()
+        # Sadece farklı bir API aynı öneki kullanıyorsa key uzatılır
+        for length in range(12, len(digest) + 1, 4):
+            holder = saved_apis.get(digest[:length])
+            if holder is None or _api_identity(holder) == identity:
+                return digest[:length]
+    raise ValueError("API key üretilemedi")
+
+def search_apis(query=None, host=None, method=None, tag=None, offset=0, limit=API_PAGE_LIMIT):
+    """İndeksleri kullanarak API'leri filtreler, (toplam, [(key, api)]) döndürür"""
+    query = (query or "").strip().lower()
+    with saved_apis_lock:
+        filters = []
+        if host:
+            filters.append(api_host_index.get(host.lower(), set()))
+        if method:
+            filters.append(api_method_index.get(method.upper(), set()))
+        if tag:
+            filters.append(api_tag_index.get(tag, set()))
+        if len(query) >= 3:
+            filters.extend(api_trigram_index.get(gram, set()) for gram in _trigrams(query))
+        
+        if not filters and not query:
+            page = itertools.islice(saved_apis.items(), offset, offset + limit)
+            return len(saved_apis), list(page)
+        
+        if filters:
+            # En küçük kümeden başlayarak kesişim al
+            filters.sort(key=len)
+            candidates = set(filters[0]).intersection(*filters[1:])
+            keys = sorted(candidates, key=api_order.__getitem__)
+        else:
+            keys = list(saved_apis)
+        if query:
+            # Trigram eşleşmesi aday üretir, gerçek alt metin kontrolü burada
+            keys = [key for key in keys if query in _search_text(saved_apis[key])]
+        
+        return len(keys), [(key, saved_apis[key]) for key in keys[offset:offset + limit]]
+
+def _index_saved_apis():
+    """Varsayılan API'leri indeksler"""
+    with saved_apis_lock:
+        for api_key, api_config in saved_apis.items():
+            _index_api(api_key, api_config)
+
+_index_saved_apis()
+
+def render_callback(value, replacements):
+    """Payload içindeki {callback_url} / {callback_token} yer tutucularını doldurur"""
+    if isinstance(value, str):
+        for placeholder, replacement in replacements.items():
+            value = value.replace(placeholder, replacement)
+        return value
+    if isinstance(value, dict):
+        return {k: render_callback(v, replacements) for k, v in value.items()}
+    if isinstance(value, list):
+        return [render_callback(v, replacements) for v in value]
+    return value
+
+def register_callback(plan):
+    """İstek için correlation token üretir ve bekleyen callback olarak kaydeder"""
+    token = uuid.uuid4().hex
+    info = {
+        "token": token,
+        "url": f"{CALLBACK_BASE_URL.rstrip('/')}/callback/{token}",
+        "status": "pending",
+        "e2e_latency": None
+    }
+    now = time.monotonic()
+    with callback_lock:
+        pending_callbacks[token] = {
+            "sent_at": now,
+            "deadline": now + plan.callback_timeout,
+            "api_name": plan.name,
+            "url": plan.url,
+            "info": info
+        }
+    _ensure_callback_sweeper()
+    return info
+
+def cancel_callback(token):
+    """İstek hiç gönderilemediyse bekleyen callback'i siler"""
+    with callback_lock:
+        entry = pending_callbacks.pop(token, None)
+    if entry is not None:
+        entry["info"]["status"] = "cancelled"
+
+def complete_callback(token, payload=None):
+    """Gelen callback'i isteğiyle eşleştirir, uçtan uca süreyi kaydeder"""
+    with callback_lock:
+        entry = pending_callbacks.pop(token, None)
+    if entry is None:
+        return None
+    
+    latency = time.monotonic() - entry["sent_at"]
+    info = entry["info"]
+    with history_lock:
+        # info history kaydı ile paylaşıldığından geçmiş de güncellenir
+        info["status"] = "received"
+        info["e2e_latency"] = round(latency, 4)
+        info["received_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        info["payload"] = payload
+    record_callback_stats(entry["api_name"], entry["url"], latency)
+    print(f"[{datetime.now()}] {entry['api_name']} callback alındı, uçtan uca süre: {latency:.3f}s")
+    return info
+
+def expire_callbacks(now=None):
+    """Süresi dolan callback'leri timeout olarak işaretler"""
+    now = time.monotonic() if now is None else now
+    with callback_lock:
+        expired = [token for token, entry in pending_callbacks.items() if entry["deadline"] <= now]
+        entries = [pending_callbacks.pop(token) for token in expired]
+    for entry in entries:
+        with history_lock:
+            entry["info"]["status"] = "timeout"
+        record_callback_stats(entry["api_name"], entry["url"], None)
+        print(f"[{datetime.now()}] {entry['api_name']} callback zaman aşımına uğradı")
+    return len(entries)
+
+def _ensure_callback_sweeper():
+    """Timeout kontrolü yapan arka plan thread'ini (bir kez) başlatır"""
+    global _callback_sweeper
+    with callback_lock:
+        if _callback_sweeper is not None:
+            return
+        
+        def sweep():
+            while True:
+                time.sleep(1)
+                expire_callbacks()
+        
+        _callback_sweeper = threading.Thread(target=sweep, name="callback-sweeper", daemon=True)
+        _callback_sweeper.start()
+
+def clear_request_history():
+    """Geçmişi ve geçmişe ait body referanslarını temizler"""
+    with history_lock:
+        for record in request_history:
+            _release_body(record["response_hash"])
+        request_history.clear()
+
+def load_saved_apis(path=None):
+    """Kayıtlı API'leri dosyadan yükler. Varsayılan dosya yoksa sadece varsayılanlar
+    kalır; açıkça verilen dosya yoksa FileNotFoundError, bozuksa ValueError"""
+    if path is None:
+        path = SAVED_APIS_FILE
+        if not os.path.exists(path):
+            return
+    with open(path, encoding="utf-8") as f:
+        apis = json.load(f)
+    if not isinstance(apis, dict) or not all(isinstance(api, dict) for api in apis.values()):
+        raise ValueError(f"{path}: API key -> konfigürasyon objesi olmalı")
+    with saved_apis_lock:
+        for api_key, api_config in apis.items():
+            api_config["tags"] = normalize_tags(api_config.get("tags"))
+            _unindex_api(api_key)
+            saved_apis[api_key] = api_config
+            _index_api(api_key, api_config)
+        request_plans.clear()
+
+def write_saved_apis(apis):
+    """API'leri dosyaya atomik olarak yazar"""
+    tmp_path = SAVED_APIS_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(apis, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, SAVED_APIS_FILE)
+
+def save_api_config(api_key, api_config):
+    """API'yi derleyip kaydeder; desteklenmeyen konfigürasyonda ValueError,
+    dosya yazılamazsa OSError (bu durumda bellekteki registry değişmez)"""
+    api_config["tags"] = normalize_tags(api_config.get("tags"))
+    plan = compile_request_plan(api_config)
+    with persist_lock:
+        # Önce diske yaz: dump sırasında aramalar bloklanmaz, hata olursa
+        # bellek ve dosya tutarlı kalır
+        with saved_apis_lock:
+            snapshot = dict(saved_apis)
+        snapshot[api_key] = api_config
+        write_saved_apis(snapshot)
+        
+        with saved_apis_lock:
+            _unindex_api(api_key)
+            saved_apis[api_key] = api_config
+            _index_api(api_key, api_config)
+            request_plans[api_key] = plan
+    return plan
+
+def make_api_request(api_config, custom_data=None, plan=None, schedule_key=None):
+    """API'ye istek gönderen fonksiyon (plan verilirse custom data zaten birleştirilmiştir)"""
+    callback = None
+    response = None
+    try:
+        with timed_stage("config_merge"):
+            if plan is None:
+                plan = compile_request_plan(api_config, custom_data)
+            url = plan.url
+            method = plan.method
+            data = plan.data
+        
+        print(f"[{datetime.now()}] {plan.name} için istek gönderiliyor...")
+        print(f"URL: {url}")
+        print(f"Method: {method}")
+        print(f"Data: {data}")
+        
+        with timed_stage("request_build"):
+            upload_stats = None
+            if plan.callback_timeout is not None:
+                # Her istek kendi correlation token'ını payload'a taşır
+                callback = register_callback(plan)
+                data = render_callback(data, {"{callback_url}": callback["url"], "{callback_token}": callback["token"]})
+            
+            if plan.stream:
+                # Büyük body'ler dosyadan / üreteçten chunked olarak akıtılır
+                stream_body, upload_stats = build_stream_body(plan.config)
+                params = data if plan.data_type == "params" and data else None
+                prepared = build_prepared(method, url, plan.headers, data=stream_body, params=params)
+            elif callback is not None:
+                prepared = build_prepared(method, url, plan.headers, **plan.dispatch(data))
+            else:
+                prepared = plan.prepared.copy()
+        
+        with timed_stage("network"):
+            response = send_prepared(prepared, plan.timeout)
+        
+        with timed_stage("response_parse"):
+            # Response'u işle
+            result = {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "api_name": plan.name,
+                "url": url,
+                "method": method,
+                "status_code": response.status_code,
+                "response_time": response.elapsed.total_seconds(),
+                "headers": dict(response.headers),
+                "response": {}
+            }
+            
+            if callback is not None:
+                result["callback"] = callback
+            
+            if upload_stats is not None:
+                result["upload"] = upload_summary(upload_stats)
+                print(f"Upload: {result['upload']['bytes']} byte, {result['upload']['mb_per_s']} MB/s")
+            
+            try:
+                if response.headers.get('content-type', '').startswith('application/json'):
+                    result["response"] = response.json()
+                else:
+                    result["response"] = {"text": response.text[:500]}  # İlk 500 karakter
+            except:
+                result["response"] = {"text": "Response parse edilemedi"}
+        
+        with timed_stage("history_append"):
+            append_history(result, schedule_key, plan.ignore_fields)
+            
+        print(f"[{datetime.now()}] İstek tamamlandı. Durum: {response.status_code}")
+        return result
+        
+    except Exception as e:
+        if callback is not None and response is None:
+            # İstek hiç gitmediyse (body dosyası yok, geçersiz URL, ağ hatası) token timeout sayılmasın
+            cancel_callback(callback["token"])
+        error_result = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "api_name": api_config.get("name", "Unknown API"),
+            "url": api_config.get("url", ""),
+            "method": api_config.get("method", "GET"),
+            "status_code": "ERROR",
+            "response_time": None,
+            "headers": {},
+            "response": {"error": str(e)}
+        }
+        append_history(error_result, schedule_key)
+        print(f"[{datetime.now()}] Hata: {str(e)}")
+        return error_result
+
+def build_schedule_job(api_name, api_config, custom_data=None):
+    """Schedule tick'inde çalışacak fonksiyonu üretir (sonucu döndürür)"""
+    # Plan schedule başına bir kez derlenir; /save-api sonrası yeniden derlenir
+    compiled = {"base": None, "plan": None}
+    
+    def job():
+        base = get_request_plan(api_name)
+        if base is None:
+            return make_api_request(api_config, custom_data, schedule_key=api_name)
+        if compiled["base"] is not base:
+            compiled["plan"] = compile_request_plan(base.config, custom_data)
+            compiled["base"] = base
+        return make_api_request(base.config, plan=compiled["plan"], schedule_key=api_name)
+    
+    return job
+
+def schedule_api_request(api_name, api_config, interval_minutes=5, custom_data=None):
+    """Periyodik API isteklerini planlayan fonksiyon"""
+    import schedule
+    job = build_schedule_job(api_name, api_config, custom_data)
+    
+    # Bu API için eski classic döngüyü ve spread işini durdur
+    token = object()
+    with spread_cond:
+        classic_schedules[api_name] = token
+        spread_jobs.pop(api_name, None)
+        active_schedules[api_name] = True
+    
+    # Yeni schedule oluştur (her döngünün kendi scheduler'ı, başka key'in işini çalıştırmaz)
+    scheduler = schedule.Scheduler()
+    scheduler.every(interval_minutes).minutes.do(job)
+    
+    print(f"[{datetime.now()}] {api_name} için {interval_minutes} dakikada bir istek planlandı")
+    
+    # İlk isteği hemen gönder
+    threading.Thread(target=job).start()
+    
+    # Schedule loop'u çalıştır
+    while active_schedules.get(api_name, False) and classic_schedules.get(api_name) is token:
+        scheduler.run_pending()
+        time.sleep(1)
+    
+    with spread_cond:
+        if classic_schedules.get(api_name) is token:
+            del classic_schedules[api_name]
+
+def schedule_phase(api_name, interval):
+    """İş ID'sinin hash'inden interval içindeki sabit faz kaydırmasını hesaplar"""
+    digest = hashlib.sha256(api_name.encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64 * interval
+
+def next_slot(phase, interval, after):
+    """after'dan sonraki ilk (phase + k * interval) zamanı"""
+    k = (after - phase) // interval + 1
+    return phase + k * interval
+
+def start_spread_schedule(api_name, api_config, interval_minutes=5, custom_data=None):
+    """İşi faz kaydırmalı, adaptif spread scheduler'a ekler"""
+    interval = float(interval_minutes) * 60
+    phase = schedule_phase(api_name, interval)
+    job = {
+        "key": api_name,
+        "run": build_schedule_job(api_name, api_config, custom_data),
+        "interval": interval,
+        "current_interval": interval,
+        "phase": phase,
+        "failures": 0,
+        "next_run": next_slot(phase, interval, time.time())
+    }
+    
+    _ensure_spread_dispatcher()
+    with spread_cond:
+        # Aynı key için eski iş heap'ten çıktığında atlanır, classic döngü varsa durur
+        spread_jobs[api_name] = job
+        classic_schedules.pop(api_name, None)
+        active_schedules[api_name] = True
+        heapq.heappush(spread_heap, (job["next_run"], next(_spread_seq), job))
+        spread_cond.notify()
+    
+    print(f"[{datetime.now()}] {api_name} için {interval_minutes} dakikada bir istek planlandı "
+          f"(spread, faz {phase:.1f}s)")
+    return job
+
+def _ensure_spread_dispatcher():
+    """Dispatcher thread'ini ve worker havuzunu (bir kez) başlatır"""
+    global _spread_dispatcher, _spread_executor
+    with spread_cond:
+        if _spread_dispatcher is not None:
+            return
+        _spread_executor = ThreadPoolExecutor(max_workers=SCHEDULER_WORKERS, thread_name_prefix="schedule")
+        _spread_dispatcher = threading.Thread(target=_spread_dispatch_loop, name="schedule-dispatcher", daemon=True)
+        _spread_dispatcher.start()
+
+def _spread_dispatch_loop():
+    """Zamanı gelen işleri worker havuzuna dağıtır"""
+    with spread_cond:
+        while True:
+            if not spread_heap:
+                spread_cond.wait()
+                continue
+            run_at, _, job = spread_heap[0]
+            delay = run_at - time.time()
+            if delay > 0:
+                spread_cond.wait(delay)
+                continue
+            heapq.heappop(spread_heap)
+            if spread_jobs.get(job["key"]) is not job or not active_schedules.get(job["key"]):
+                continue
+            _record_dispatch(time.time())
+            _spread_executor.submit(_run_spread_job, job, run_at)
+
+def _record_dispatch(now):
+    """Dağıtım profiline bir iş ekler (spread_cond altında)"""
+    second = int(now)
+    dispatch_counts[second] = dispatch_counts.get(second, 0) + 1
+    cutoff = second - DISPATCH_PROFILE_WINDOW
+    while dispatch_counts and next(iter(dispatch_counts)) <= cutoff:
+        dispatch_counts.popitem(last=False)
+
+def _run_spread_job(job, run_at):
+    """İşi çalıştırır, sonuca göre interval'i ayarlar ve yeniden kuyruğa koyar"""
+    try:
+        result = job["run"]()
+        status = result["status_code"]
+        failed = not isinstance(status, int) or status >= 500
+    except Exception as e:
+        print(f"[{datetime.now()}] {job['key']} schedule hatası: {e}")
+        failed = True
+    
+    with spread_cond:
+        if failed:
+            # Hata veren hedefin frekansını düşür (interval'in katları, faz korunur)
+            job["failures"] += 1
+            job["current_interval"] = job["interval"] * min(2 ** job["failures"], SCHEDULE_MAX_BACKOFF)
+        elif job["failures"]:
+            print(f"[{datetime.now()}] {job['key']} düzeldi, interval normale döndü")
+            job["failures"] = 0
+            job["current_interval"] = job["interval"]
+        
+        next_run = run_at + job["current_interval"]
+        if next_run <= time.time():
+            # Geciken iş kaçırdığı slotları atlar, faz ızgarasında kalır
+            next_run = next_slot(job["phase"], job["interval"], time.time())
+        job["next_run"] = next_run
+        
+        if spread_jobs.get(job["key"]) is job and active_schedules.get(job["key"]):
+            heapq.heappush(spread_heap, (next_run, next(_spread_seq), job))
+            spread_cond.notify()
+
+def get_dispatch_profile(window=300):
+    """Son window saniyedeki saniye başına dağıtım sayıları ve özetleri"""
+    now = int(time.time())
+    with spread_cond:
+        counts = [dispatch_counts.get(second, 0) for second in range(now - window + 1, now + 1)]
+    total = sum(counts)
+    mean = total / window if window else 0
+    return {
+        "window": window,
+        "total": total,
+        "mean_per_s": round(mean, 4),
+        "max_per_s": max(counts) if counts else 0,
+        "peak_to_mean": round(max(counts) / mean, 2) if mean else None,
+        "counts": counts
+    }
+
+def get_spread_jobs():
+    """Spread scheduler'daki işlerin durumunu döndürür"""
+    with spread_cond:
+        return [
+            {
+                "key": job["key"],
+                "active": bool(active_schedules.get(job["key"])),
+                "interval": job["interval"],
+                "current_interval": job["current_interval"],
+                "phase": round(job["phase"], 3),
+                "failures": job["failures"],
+                "next_run": datetime.fromtimestamp(job["next_run"]).strftime("%Y-%m-%d %H:%M:%S")
+            }
+            for job in spread_jobs.values()
+        ]
@@ -0,0 +1,157 @@
+"""Callback token yaşam döngüsü testleri (kayıt, eşleşme, timeout, iptal)"""
+import types
+from datetime import timedelta
+
+import pytest
+
+import core
+
+
+@pytest.fixture(autouse=True)
+def empty_callbacks(monkeypatch):
+    monkeypatch.setattr(core, "pending_callbacks", {})
+    monkeypatch.setattr(core, "request_history", [])
+    monkeypatch.setattr(core, "response_store", {})
+    monkeypatch.setattr(core, "stats_buckets", {resolution: {} for resolution in core.STATS_RESOLUTIONS})
+    # Timeout'ları testler expire_callbacks ile kendisi tetikler
+    monkeypatch.setattr(core, "_ensure_callback_sweeper", lambda: None)
+
+
+def make_plan(callback_timeout=30.0, data=None):
+    return types.SimpleNamespace(
+        config={"name": "Async API", "url": "http://h.example.com/jobs"},
+        name="Async API",
+        url="http://h.example.com/jobs",
+        method="POST",
+        data_type="json",
+        headers={},
+        data=data if data is not None else {"callback": "{callback_url}"},
+        timeout=5,
+        stream=False,
+        prepared=None,
+        ignore_fields=(),
+        dispatch=lambda data: {"json": data},
+        callback_timeout=callback_timeout
+    )
+
+
+def callback_stats():
+    [bucket] = core.get_stats("minute", "api", "Async API")["Async API"]
+    return bucket["callbacks"], bucket["callback_timeouts"]
+
+
+def test_render_callback_fills_nested_placeholders():
+    payload = {
+        "notify": {"url": "{callback_url}", "headers": ["X-Token: {callback_token}"]},
+        "id": "{callback_token}-{callback_token}",
+        "count": 3,
+        "flag": None
+    }
+    rendered = core.render_callback(payload, {"{callback_url}": "http://cb/t1", "{callback_token}": "t1"})
+    assert rendered == {
+        "notify": {"url": "http://cb/t1", "headers": ["X-Token: t1"]},
+        "id": "t1-t1",
+        "count": 3,
+        "flag": None
+    }
+    assert payload["id"] == "{callback_token}-{callback_token}"
+
+
+def test_register_callback_creates_unique_pending_tokens(monkeypatch):
+    monkeypatch.setattr(core, "CALLBACK_BASE_URL", "http://receiver.example.com/")
+    first = core.register_callback(make_plan())
+    second = core.register_callback(make_plan())
+    
+    assert first["token"] != second["token"]
+    assert first["url"] == f"http://receiver.example.com/callback/{first['token']}"
+    assert first["status"] == "pending"
+    assert set(core.pending_callbacks) == {first["token"], second["token"]}
+
+
+def test_complete_callback_updates_shared_history_record():
+    info = core.register_callback(make_plan())
+    core.append_history({"timestamp": "2024-01-01 00:00:00", "api_name": "Async API",
+                         "url": "http://h.example.com/jobs", "method": "POST", "status_code": 202,
+                         "response_time": 0.05, "headers": {}, "response": {}, "callback": info})
+    
+    assert core.complete_callback(info["token"], {"done": True}) is info
+    record = core.request_history[-1]["callback"]
+    assert record["status"] == "received"
+    assert record["payload"] == {"done": True}
+    assert record["e2e_latency"] >= 0
+    assert core.pending_callbacks == {}
+    assert callback_stats() == (1, 0)
+    
+    # Aynı token ikinci kez eşleşmez
+    assert core.complete_callback(info["token"]) is None
+
+
+def test_unknown_token_returns_none():
+    assert core.complete_callback("yok") is None
+    assert core.stats_buckets["minute"] == {}
+
+
+def test_expired_callbacks_are_timeouts():
+    late = core.register_callback(make_plan(callback_timeout=1))
+    on_time = core.register_callback(make_plan(callback_timeout=60))
+    
+    assert core.expire_callbacks(core.time.monotonic() + 5) == 1
+    assert late["status"] == "timeout"
+    assert on_time["status"] == "pending"
+    assert list(core.pending_callbacks) == [on_time["token"]]
+    assert callback_stats() == (0, 1)
+    assert core.complete_callback(late["token"]) is None
+
+
+def test_cancel_callback_is_not_counted():
+    info = core.register_callback(make_plan(callback_timeout=1))
+    core.cancel_callback(info["token"])
+    core.cancel_callback(info["token"])
+    
+    assert info["status"] == "cancelled"
+    assert core.expire_callbacks(core.time.monotonic() + 5) == 0
+    assert core.stats_buckets["minute"] == {}
+
+
+def test_failed_send_cancels_callback(monkeypatch):
+    sent = []
+    
+    def send_prepared(prepared, timeout):
+        sent.append(prepared)
+        raise ConnectionError("bağlantı reddedildi")
+    
+    monkeypatch.setattr(core, "build_prepared", lambda method, url, headers, **kwargs: kwargs)
+    monkeypatch.setattr(core, "send_prepared", send_prepared)
+    
+    result = core.make_api_request({"name": "Async API"}, plan=make_plan())
+    assert result["status_code"] == "ERROR"
+    # Token payload'a işlendi ama istek gitmediği için bekleyen callback kalmadı
+    assert sent[0]["json"]["callback"].startswith(core.CALLBACK_BASE_URL)
+    assert core.pending_callbacks == {}
+    assert core.expire_callbacks(core.time.monotonic() + 60) == 0
+
+
+def test_failed_build_cancels_callback(monkeypatch):
+    def build_prepared(method, url, headers, **kwargs):
+        raise ValueError("Geçersiz URL")
+    
+    monkeypatch.setattr(core, "build_prepared", build_prepared)
+    result = core.make_api_request({"name": "Async API"}, plan=make_plan())
+    assert result["status_code"] == "ERROR"
+    assert core.pending_callbacks == {}
+
+
+def test_sent_request_keeps_callback_pending(monkeypatch):
+    response = types.SimpleNamespace(
+        status_code=202, elapsed=timedelta(seconds=0.05),
+        headers={"content-type": "application/json"}, json=lambda: {"accepted": True}, text=""
+    )
+    monkeypatch.setattr(core, "build_prepared", lambda method, url, headers, **kwargs: kwargs)
+    monkeypatch.setattr(core, "send_prepared", lambda prepared, timeout: response)
+    
+    result = core.make_api_request({"name": "Async API"}, plan=make_plan())
+    token = result["callback"]["token"]
+    assert list(core.pending_callbacks) == [token]
+    
+    core.complete_callback(token, {"ok": 1})
+    assert core.request_history[-1]["callback"]["status"] == "received"
@@ -0,0 +1,107 @@
+"""Komut satırı çalıştırıcısı testleri (core sahte bir modülle değiştirilir)"""
+import io
+import sys
+import types
+
+import pytest
+
+import cli
+import core as real_core
+
+
+class FakeCore:
+    """Ağ isteği göndermeyen, sabit sonuç döndüren core yerine geçen nesne"""
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.sent = []
+        self.saved_apis = {"default": {"name": "Default", "method": "GET", "url": "http://h.example.com"}}
+
+    def load_saved_apis(self, path=None):
+        # Dosya hataları gerçek core'daki gibi (registry'ye dokunmadan önce) yükselir
+        if path is not None:
+            real_core.load_saved_apis(path)
+
+    def get_request_plan(self, key):
+        if key != "default":
+            return None
+        return types.SimpleNamespace(config={"name": "Default", "url": "http://h.example.com"})
+
+    def compile_request_plan(self, config, data=None):
+        return types.SimpleNamespace(config=config, data=data)
+
+    def make_api_request(self, api_config, custom_data=None, plan=None, schedule_key=None):
+        self.sent.append(schedule_key)
+        return {"api_name": api_config["name"], "status_code": self.status_code,
+                "response_time": 0.01, "response": {}}
+
+
+def run(argv, core):
+    args = cli.parse_args(argv)
+    reporter = cli.Reporter(args, io.StringIO())
+    cli.run_command(args, core, reporter, None)
+    return reporter
+
+
+def test_schedule_does_not_sleep_after_last_tick(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(cli.time, "sleep", sleeps.append)
+    core = FakeCore()
+    
+    reporter = run(["schedule", "default", "--ticks", "1", "--every", "300"], core)
+    assert core.sent == ["default"]
+    assert reporter.total == 1
+    assert sleeps == []
+
+
+def test_schedule_sleeps_between_ticks_only(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(cli.time, "sleep", sleeps.append)
+    core = FakeCore()
+    
+    run(["schedule", "default", "--ticks", "3", "--every", "0"], core)
+    assert core.sent == ["default"] * 3
+    assert len(sleeps) == 2
+
+
+def test_schedule_unknown_key_is_lookup_error():
+    with pytest.raises(LookupError):
+        run(["schedule", "default", "yok", "--ticks", "1"], FakeCore())
+
+
+@pytest.fixture
+def main(monkeypatch):
+    """cli.main'i sahte core ile çalıştırır"""
+    def call(argv, status_code=200):
+        monkeypatch.setitem(sys.modules, "core", FakeCore(status_code))
+        return cli.main(argv)
+    return call
+
+
+def test_exit_ok_when_all_checks_pass(main, capsys):
+    assert main(["run", "default", "--repeat", "2"]) == cli.EXIT_OK
+    assert '"passed": 2' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("argv, status_code", [
+    (["run", "default"], 500),
+    (["run", "default", "--expect-status", "201"], 200),
+    (["run", "default", "--expect-text", "yok"], 200),
+])
+def test_exit_assertion_failed(main, argv, status_code):
+    assert main(argv, status_code) == cli.EXIT_ASSERTION_FAILED
+
+
+def test_exit_usage_for_config_errors(main, tmp_path, capsys):
+    bad = tmp_path / "bad.json"
+    bad.write_text("{bozuk", encoding="utf-8")
+    not_object = tmp_path / "list.json"
+    not_object.write_text("[1, 2]", encoding="utf-8")
+    
+    assert main(["run", "default", "--apis-file", str(bad)]) == cli.EXIT_USAGE
+    assert main(["list", "--apis-file", str(tmp_path / "yok.json")]) == cli.EXIT_USAGE
+    assert main(["run", "default", "--apis-file", str(not_object)]) == cli.EXIT_USAGE
+    assert main(["run", "yok"]) == cli.EXIT_USAGE
+    assert main(["run", "default", "--data", "{bozuk"]) == cli.EXIT_USAGE
+    assert main(["batch", "default", "--dataset", str(not_object)]) == cli.EXIT_USAGE
+    assert "Traceback" not in capsys.readouterr().err
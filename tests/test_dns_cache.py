@@ -0,0 +1,141 @@
+"""Cache'li getaddrinfo testleri (sistem resolver'ı ve saat sahte)"""
+import socket
+import time
+import types
+
+import pytest
+
+import core
+
+ADDR = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 443))]
+NEW_ADDR = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.2", 443))]
+
+
+class FakeResolver:
+    """Sırayla verilen sonuçları döndürür ya da hatayı yükseltir"""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        self.calls.append(host)
+        answer = self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(core, "time", types.SimpleNamespace(monotonic=lambda: now[0],
+                                                              perf_counter=time.perf_counter))
+    monkeypatch.setattr(core, "dns_cache", {})
+    monkeypatch.setattr(core, "dns_stats", {})
+    monkeypatch.setattr(core, "DNS_CACHE_TTL", 30.0)
+    monkeypatch.setattr(core, "DNS_NEGATIVE_TTL", 10.0)
+    return now
+
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    """Arka plan yenilemelerini thread yerine testin çalıştırması için biriktirir"""
+    started = []
+    
+    class Thread:
+        def __init__(self, target, args=(), daemon=None):
+            self.run = lambda: target(*args)
+        
+        def start(self):
+            started.append(self.run)
+    
+    monkeypatch.setattr(core, "threading", types.SimpleNamespace(Thread=Thread))
+    return started
+
+
+def use_resolver(monkeypatch, *answers):
+    resolver = FakeResolver(*answers)
+    monkeypatch.setattr(core, "_system_getaddrinfo", resolver)
+    return resolver
+
+
+def lookup(host="api.example.com"):
+    return core.cached_getaddrinfo(host, 443, 0, socket.SOCK_STREAM)
+
+
+def test_hit_within_ttl_and_miss_after_expiry(monkeypatch, clock, refreshes):
+    resolver = use_resolver(monkeypatch, ADDR, NEW_ADDR)
+    assert lookup() == ADDR
+    clock[0] += 20
+    assert lookup() == ADDR
+    assert resolver.calls == ["api.example.com"]
+    
+    clock[0] += 15
+    assert lookup() == NEW_ADDR
+    stats = core.get_dns_stats()["hosts"]["api.example.com"]
+    assert (stats["hits"], stats["misses"], stats["resolutions"]) == (1, 2, 2)
+
+
+def test_negative_cache_reraises_gaierror(monkeypatch, clock):
+    resolver = use_resolver(monkeypatch, socket.gaierror(socket.EAI_NONAME, "Name or service not known"), ADDR)
+    for _ in range(3):
+        with pytest.raises(socket.gaierror) as excinfo:
+            lookup("missing.example.com")
+        assert excinfo.value.args[0] == socket.EAI_NONAME
+    assert len(resolver.calls) == 1
+    assert core.get_dns_stats()["hosts"]["missing.example.com"]["negative_hits"] == 2
+    
+    # Negatif TTL dolunca yeniden denenir
+    clock[0] += 11
+    assert lookup("missing.example.com") == ADDR
+
+
+def test_refresh_ahead_updates_entry_in_background(monkeypatch, clock, refreshes):
+    resolver = use_resolver(monkeypatch, ADDR, NEW_ADDR)
+    lookup()
+    clock[0] += 30 * core.DNS_REFRESH_AHEAD + 1
+    
+    # Yenileme sırasında eski kayıt dönmeye devam eder, tek yenileme başlar
+    assert lookup() == ADDR
+    assert lookup() == ADDR
+    assert len(refreshes) == 1
+    refreshes[0]()
+    
+    assert lookup() == NEW_ADDR
+    assert len(resolver.calls) == 2
+    assert core.get_dns_stats()["hosts"]["api.example.com"]["refreshes"] == 1
+
+
+def test_failed_refresh_keeps_valid_entry(monkeypatch, clock, refreshes):
+    use_resolver(monkeypatch, ADDR, socket.gaierror(socket.EAI_AGAIN, "Temporary failure"))
+    lookup()
+    clock[0] += 25
+    lookup()
+    refreshes[0]()
+    
+    assert lookup() == ADDR
+    assert core.get_dns_stats()["hosts"]["api.example.com"]["errors"] == 1
+    # Kayıt tekrar yenilenebilir
+    lookup()
+    assert len(refreshes) == 2
+
+
+def test_ip_literals_bypass_cache(monkeypatch, clock):
+    resolver = use_resolver(monkeypatch, ADDR)
+    for host in ("10.0.0.1", "::1", b"127.0.0.1", "10.0.0.1"):
+        assert core.cached_getaddrinfo(host, 443) == ADDR
+    assert len(resolver.calls) == 4
+    assert core.dns_cache == {}
+    assert core.dns_stats == {}
+
+
+def test_expired_entries_are_pruned_on_miss(monkeypatch, clock):
+    use_resolver(monkeypatch, ADDR)
+    for i in range(5):
+        lookup(f"host{i}.example.com")
+    assert len(core.dns_cache) == 5
+    
+    clock[0] += 31
+    lookup("fresh.example.com")
+    assert [key[0] for key in core.dns_cache] == ["fresh.example.com"]
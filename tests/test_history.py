@@ -0,0 +1,114 @@
+"""Tekilleştirilmiş response deposu ve schedule değişiklik takibi testleri"""
+import pytest
+
+import core
+
+
+@pytest.fixture(autouse=True)
+def empty_history(monkeypatch):
+    monkeypatch.setattr(core, "request_history", [])
+    monkeypatch.setattr(core, "response_store", {})
+    monkeypatch.setattr(core, "last_response_hash", {})
+    monkeypatch.setattr(core, "change_feeds", {})
+    monkeypatch.setattr(core, "stats_buckets", {resolution: {} for resolution in core.STATS_RESOLUTIONS})
+
+
+def make_result(body, url="http://api.example.com/users", status_code=200):
+    return {
+        "timestamp": "2024-01-01 00:00:00",
+        "api_name": "Test API",
+        "url": url,
+        "method": "GET",
+        "status_code": status_code,
+        "response_time": 0.1,
+        "headers": {},
+        "response": body
+    }
+
+
+def refs():
+    return sorted(stored["refs"] for stored in core.response_store.values())
+
+
+def test_identical_bodies_share_one_stored_copy():
+    for _ in range(5):
+        core.append_history(make_result({"users": [1, 2, 3]}))
+    core.append_history(make_result({"users": []}))
+    
+    assert len(core.request_history) == 6
+    assert refs() == [1, 5]
+    record = core.request_history[0]
+    assert "response" not in record
+    assert core.expand_record(record)["response"] == {"users": [1, 2, 3]}
+
+
+def test_hash_ignores_key_order_and_ignored_fields():
+    assert core.hash_body({"a": 1, "b": 2}) == core.hash_body({"b": 2, "a": 1})
+    first = {"data": {"id": 1, "fetched_at": "10:00"}}
+    second = {"data": {"id": 1, "fetched_at": "10:05"}}
+    assert core.hash_body(first) != core.hash_body(second)
+    assert core.hash_body(first, ["fetched_at"]) == core.hash_body(second, ["fetched_at"])
+
+
+def test_evicted_records_release_their_bodies(monkeypatch):
+    monkeypatch.setattr(core, "HISTORY_LIMIT", 3)
+    for i in range(5):
+        core.append_history(make_result({"n": i}))
+    
+    assert [core.expand_record(r)["response"] for r in core.request_history] == [{"n": 2}, {"n": 3}, {"n": 4}]
+    assert refs() == [1, 1, 1]
+    
+    core.clear_request_history()
+    assert core.request_history == []
+    assert core.response_store == {}
+
+
+def test_change_feed_keeps_body_after_history_eviction(monkeypatch):
+    monkeypatch.setattr(core, "HISTORY_LIMIT", 1)
+    core.append_history(make_result({"v": 1}), schedule_key="job")
+    core.append_history(make_result({"v": 2}), schedule_key="job")
+    
+    # v1 geçmişten düştü ama değişiklik akışında hâlâ referanslı
+    feed = core.change_feeds["job"]
+    assert [core.expand_record(entry)["response"] for entry in feed] == [{"v": 1}, {"v": 2}]
+    assert feed[1]["previous_hash"] == feed[0]["response_hash"]
+    
+    core.clear_request_history()
+    assert len(core.response_store) == 2
+
+
+def test_change_feed_is_bounded(monkeypatch):
+    monkeypatch.setattr(core, "CHANGE_FEED_LIMIT", 2)
+    monkeypatch.setattr(core, "HISTORY_LIMIT", 2)
+    for i in range(4):
+        core.append_history(make_result({"v": i}), schedule_key="job")
+    
+    assert len(core.change_feeds["job"]) == 2
+    assert len(core.response_store) == 2
+
+
+def test_changes_are_tracked_only_for_schedules():
+    result = make_result({"v": 1})
+    core.append_history(result)
+    assert result["changed"] is None
+    assert core.last_response_hash == {}
+    assert core.change_feeds == {}
+    
+    changed = []
+    for body in ({"v": 1}, {"v": 1}, {"v": 2}, {"v": 2}, {"v": 1}):
+        result = make_result(body)
+        core.append_history(result, schedule_key="job")
+        changed.append(result["changed"])
+    
+    assert changed == [True, False, True, False, True]
+    assert len(core.change_feeds["job"]) == 3
+    assert list(core.last_response_hash) == ["job"]
+
+
+def test_ignored_fields_do_not_count_as_change():
+    for minute in ("00", "05"):
+        result = make_result({"price": 10, "server_time": f"10:{minute}"})
+        core.append_history(result, schedule_key="job", ignore_fields=("server_time",))
+    
+    assert result["changed"] is False
+    assert len(core.change_feeds["job"]) == 1
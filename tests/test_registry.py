@@ -0,0 +1,131 @@
+"""İndeksli API registry araması ve sayfalama testleri"""
+import itertools
+
+import pytest
+
+import core
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(core, "saved_apis", {})
+    monkeypatch.setattr(core, "api_identity_index", {})
+    monkeypatch.setattr(core, "api_host_index", {})
+    monkeypatch.setattr(core, "api_method_index", {})
+    monkeypatch.setattr(core, "api_tag_index", {})
+    monkeypatch.setattr(core, "api_trigram_index", {})
+    monkeypatch.setattr(core, "api_order", {})
+    monkeypatch.setattr(core, "_api_seq", itertools.count())
+
+
+def add_api(name, url, method="GET", tags=()):
+    api_config = {"name": name, "url": url, "method": method, "tags": core.normalize_tags(tags)}
+    api_key = core.make_api_key(name, url)
+    with core.saved_apis_lock:
+        core._unindex_api(api_key)
+        core.saved_apis[api_key] = api_config
+        core._index_api(api_key, api_config)
+    return api_key
+
+
+def names(page):
+    return [api["name"] for _, api in page]
+
+
+def test_query_matches_name_or_url_substring():
+    add_api("User List", "https://users.example.com/v1/list")
+    add_api("Orders", "https://shop.example.com/orders")
+    add_api("Order Users", "https://shop.example.com/order-users")
+    
+    total, page = core.search_apis("user")
+    assert total == 2
+    assert names(page) == ["User List", "Order Users"]
+    assert core.search_apis("SHOP.example")[0] == 2
+
+
+def test_trigram_candidates_are_verified():
+    # "abcd"nin tüm trigram'ları var ama metin "abcd" içermiyor
+    add_api("abc bcd", "https://x.example.com")
+    add_api("abcd", "https://y.example.com")
+    assert names(core.search_apis("abcd")[1]) == ["abcd"]
+
+
+def test_short_query_falls_back_to_scan():
+    add_api("Go API", "https://go.example.com")
+    add_api("Other", "https://other.example.com")
+    assert names(core.search_apis("go")[1]) == ["Go API"]
+
+
+def test_filters_intersect():
+    add_api("A", "https://one.example.com/a", "GET", ["prod"])
+    add_api("B", "https://one.example.com/b", "POST", ["prod", "billing"])
+    add_api("C", "https://two.example.com/c", "POST", ["billing"])
+    
+    assert names(core.search_apis(host="ONE.example.com")[1]) == ["A", "B"]
+    assert names(core.search_apis(method="post")[1]) == ["B", "C"]
+    assert names(core.search_apis(tag="billing", method="POST")[1]) == ["B", "C"]
+    assert names(core.search_apis(tag="prod", host="one.example.com", method="POST")[1]) == ["B"]
+    assert core.search_apis(tag="yok") == (0, [])
+
+
+def test_pagination_keeps_insertion_order():
+    for i in range(120):
+        add_api(f"api-{i:03d}", f"https://h{i % 3}.example.com/{i}")
+    
+    total, page = core.search_apis(offset=100, limit=50)
+    assert total == 120
+    assert names(page) == [f"api-{i:03d}" for i in range(100, 120)]
+    
+    total, page = core.search_apis(host="h1.example.com", offset=10, limit=5)
+    assert total == 40
+    assert names(page) == [f"api-{i:03d}" for i in range(31, 46, 3)]
+
+
+def test_update_reindexes_and_keeps_position():
+    first = add_api("Weather", "https://old.example.com/w")
+    add_api("Second", "https://other.example.com")
+    api_config = {"name": "Weather", "url": "https://old.example.com/w", "method": "POST", "tags": ["new"]}
+    with core.saved_apis_lock:
+        core._unindex_api(first)
+        core.saved_apis[first] = api_config
+        core._index_api(first, api_config)
+    
+    assert names(core.search_apis(method="GET")[1]) == ["Second"]
+    assert names(core.search_apis(tag="new")[1]) == ["Weather"]
+    assert names(core.search_apis()[1]) == ["Weather", "Second"]
+
+
+def test_make_api_key_is_stable_and_unique():
+    key = add_api("Same", "https://a.example.com")
+    assert core.make_api_key("Same", "https://a.example.com") == key
+    assert core.make_api_key("Same", "https://b.example.com") != key
+    assert len(key) == 12
+
+
+def test_normalize_tags():
+    assert core.normalize_tags(" prod, billing ,prod,,") == ["prod", "billing"]
+    assert core.normalize_tags(["a", "a", " b "]) == ["a", "b"]
+    assert core.normalize_tags(None) == []
+
+
+def test_nameless_api_reuses_its_key():
+    keys = {add_api("", "https://noname.example.com") for _ in range(20)}
+    assert len(keys) == 1
+    assert core.search_apis()[0] == 1
+    
+    # İsim alanı hiç olmayan konfigürasyon da aynı kimliğe eşlenir
+    with core.saved_apis_lock:
+        core.saved_apis[keys.pop()].pop("name")
+        core.api_identity_index.clear()
+    assert core.make_api_key(None, "https://noname.example.com") == core.make_api_key("", "https://noname.example.com")
+    assert len(core.make_api_key("", "https://noname.example.com")) == 12
+
+
+def test_key_is_extended_only_for_a_different_api():
+    key = core.make_api_key("A", "https://a.example.com")
+    with core.saved_apis_lock:
+        core.saved_apis[key] = {"name": "B", "url": "https://b.example.com"}
+    
+    longer = add_api("A", "https://a.example.com")
+    assert longer != key and longer.startswith(key)
+    assert core.make_api_key("A", "https://a.example.com") == longer
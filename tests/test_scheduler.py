@@ -0,0 +1,104 @@
+"""Spread scheduler'ın faz ızgarası ve adaptif backoff testleri"""
+import time
+
+import pytest
+
+import core
+
+
+def make_job(run, interval=60.0):
+    phase = core.schedule_phase("job", interval)
+    return {
+        "key": "job",
+        "run": run,
+        "interval": interval,
+        "current_interval": interval,
+        "phase": phase,
+        "failures": 0,
+        "next_run": core.next_slot(phase, interval, time.time())
+    }
+
+
+def on_grid(job):
+    offset = (job["next_run"] - job["phase"]) % job["interval"]
+    return min(offset, job["interval"] - offset) < 1e-6
+
+
+def test_schedule_phase_is_stable_and_inside_interval():
+    for key in ("a", "default", "çok uzun bir api adı" * 10):
+        phase = core.schedule_phase(key, 300)
+        assert phase == core.schedule_phase(key, 300)
+        assert 0 <= phase < 300
+
+
+def test_schedule_phase_spreads_keys_across_interval():
+    phases = [core.schedule_phase(f"api-{i}", 60) for i in range(1000)]
+    per_slot = [0] * 10
+    for phase in phases:
+        per_slot[int(phase // 6)] += 1
+    # Aynı interval'deki işler tek bir saniyeye yığılmaz
+    assert min(per_slot) > 60 and max(per_slot) < 140
+
+
+@pytest.mark.parametrize("after", [0, 12.5, 59.9, 60, 1000.25, 1_700_000_000.7])
+def test_next_slot_is_next_point_on_phase_grid(after):
+    phase, interval = 12.5, 60
+    slot = core.next_slot(phase, interval, after)
+    assert after < slot <= after + interval
+    assert (slot - phase) % interval == pytest.approx(0)
+
+
+def test_failures_back_off_up_to_max_and_keep_phase():
+    job = make_job(lambda: {"status_code": 503})
+    intervals = []
+    for _ in range(6):
+        core._run_spread_job(job, job["next_run"])
+        intervals.append(job["current_interval"])
+    
+    assert intervals == [120, 240, 480, 480, 480, 480]
+    assert job["failures"] == 6
+    assert on_grid(job)
+
+
+def test_exception_counts_as_failure():
+    def run():
+        raise ConnectionError("bağlantı reddedildi")
+    
+    job = make_job(run)
+    core._run_spread_job(job, time.time())
+    assert job["failures"] == 1
+    assert job["current_interval"] == 120
+
+
+def test_success_resets_backoff():
+    responses = iter([{"status_code": "ERROR"}, {"status_code": 500}, {"status_code": 404}])
+    job = make_job(lambda: next(responses))
+    core._run_spread_job(job, time.time())
+    core._run_spread_job(job, time.time())
+    assert job["current_interval"] == 240
+    
+    # 4xx hedefin ayakta olduğunu gösterir, backoff sıfırlanır
+    core._run_spread_job(job, time.time())
+    assert job["failures"] == 0
+    assert job["current_interval"] == job["interval"]
+
+
+def test_late_job_skips_missed_slots():
+    job = make_job(lambda: {"status_code": 200})
+    now = time.time()
+    core._run_spread_job(job, now - 10 * job["interval"])
+    assert now < job["next_run"] <= time.time() + job["interval"]
+    assert on_grid(job)
+
+
+def test_replaced_job_is_not_requeued(monkeypatch):
+    monkeypatch.setattr(core, "spread_heap", [])
+    monkeypatch.setitem(core.active_schedules, "job", True)
+    job = make_job(lambda: {"status_code": 200})
+    # spread_jobs'ta başka bir iş (ör. classic'e geçilmiş) varsa eski iş heap'e dönmez
+    core._run_spread_job(job, time.time())
+    assert core.spread_heap == []
+    
+    monkeypatch.setitem(core.spread_jobs, "job", job)
+    core._run_spread_job(job, time.time())
+    assert [entry[2] for entry in core.spread_heap] == [job]
@@ -0,0 +1,85 @@
+"""Artımlı istatistik kovaları ve saklama süresi testleri"""
+import pytest
+
+import core
+
+# Dakika sınırına denk gelen sabit bir başlangıç (epoch)
+T0 = 1_700_000_040
+
+
+@pytest.fixture(autouse=True)
+def empty_stats(monkeypatch):
+    monkeypatch.setattr(core, "stats_buckets", {resolution: {} for resolution in core.STATS_RESOLUTIONS})
+
+
+def record(status_code=200, response_time=0.2, now=T0, api_name="A", url="http://h.example.com/x"):
+    core.record_stats({"api_name": api_name, "url": url, "status_code": status_code,
+                       "response_time": response_time}, now)
+
+
+def test_minute_bucket_aggregates():
+    record(200, 0.1)
+    record(201, 0.3, T0 + 59)
+    record(500, None, T0 + 30)
+    record("ERROR", None, T0 + 10)
+    
+    [bucket] = core.get_stats("minute", "api", "A", now=T0 + 120)["A"]
+    assert bucket["count"] == 4
+    assert bucket["success_rate"] == 0.5
+    assert bucket["status_codes"] == {"200": 1, "201": 1, "500": 1, "ERROR": 1}
+    assert bucket["mean_latency"] == 0.2
+    assert bucket["max_latency"] == 0.3
+
+
+def test_buckets_split_by_resolution_and_dimension():
+    record(now=T0)
+    record(now=T0 + 60, api_name="B", url="http://h.example.com/y")
+    
+    assert len(core.get_stats("minute", "api", "A", now=T0 + 120)["A"]) == 1
+    assert [b["count"] for b in core.get_stats("minute", "host", now=T0 + 120)["h.example.com"]] == [1, 1]
+    assert sum(b["count"] for b in core.get_stats("hour", "host", now=T0 + 120)["h.example.com"]) == 2
+
+
+def test_old_buckets_are_dropped_after_retention(monkeypatch):
+    monkeypatch.setattr(core, "STATS_RETENTION", {"minute": 3, "hour": 2})
+    for minute in range(6):
+        record(now=T0 + minute * 60)
+    
+    series = core.stats_buckets["minute"][("api", "A")]
+    assert list(series) == [T0 + m * 60 for m in (3, 4, 5)]
+    
+    # Uzun bir boşluktan sonra gelen ilk kayıt eski kovaların hepsini atar
+    record(now=T0 + 3600 * 5)
+    assert len(series) == 1
+    assert len(core.stats_buckets["hour"][("api", "A")]) == 1
+
+
+def test_callback_stats_share_request_buckets():
+    record(now=T0)
+    core.record_callback_stats("A", "http://h.example.com/x", 1.5, T0 + 5)
+    core.record_callback_stats("A", "http://h.example.com/x", 0.5, T0 + 6)
+    core.record_callback_stats("A", "http://h.example.com/x", None, T0 + 7)
+    
+    [bucket] = core.get_stats("minute", "api", "A", now=T0 + 120)["A"]
+    assert bucket["callbacks"] == 2
+    assert bucket["callback_timeouts"] == 1
+    assert bucket["mean_e2e_latency"] == 1.0
+    assert bucket["max_e2e_latency"] == 1.5
+
+
+def test_idle_series_expire_when_read():
+    record(now=T0, api_name="A")
+    record(now=T0, api_name="adhoc", url="http://other.example.com")
+    record(now=T0 + 10 * 86400, api_name="A")
+    
+    # Dakika saklama süresi 24 saat; 10 gün önceki kova ve sadece onu içeren seriler gitmeli
+    stats = core.get_stats("minute", "api", now=T0 + 10 * 86400)
+    assert list(stats) == ["A"]
+    assert len(stats["A"]) == 1
+    assert ("api", "adhoc") not in core.stats_buckets["minute"]
+    assert ("host", "other.example.com") not in core.stats_buckets["minute"]
+    
+    # Saat çözünürlüğü 7 gün saklar, aynı anda okunduğunda o da temizlenir
+    assert list(core.get_stats("hour", "host", now=T0 + 10 * 86400)) == ["h.example.com"]
+    assert core.get_stats("minute", "api", now=T0 + 20 * 86400) == {}
+    assert core.stats_buckets["minute"] == {}